@@ -18,6 +18,7 @@
 
 from src.pipeline import Pipeline
 from src.utils.command_line_interface import get_arguments
+from src.utils.member_filter import MemberFilter
 
 
 if __name__ == '__main__':
@@ -39,10 +40,39 @@ if __name__ == '__main__':
                         EXTRACTION_DIR,
                         TRANSFORMER_DIR,
                         AGGREGATED_DIR,
-                        OUTPUT_FILE)
+                        OUTPUT_FILE,
+                        download_engine=args.download_engine,
+                        max_bandwidth=args.max_bandwidth * 1024 ** 2 if args.max_bandwidth else None,
+                        years=args.years,
+                        member_filter=MemberFilter(args.scenario,
+                                                   args.ufs,
+                                                   args.extensions,
+                                                   args.include,
+                                                   args.exclude),
+                        cache_dir=args.cache_dir,
+                        base_url=args.base_url,
+                        mirror_dir=args.mirror_dir,
+                        from_archives=args.from_archives,
+                        validate_rows=args.validate_rows,
+                        merge_workers=args.merge_workers,
+                        column_profile=args.column_profile,
+                        chunk_size=args.chunk_size,
+                        process_workers=args.process_workers,
+                        row_group_size=args.row_group_size,
+                        compression=args.compression)
 
     # All available commands.
-    available_commands = ['initialize', 'download', 'extract', 'merge', 'aggregate', 'process']
+    available_commands = ['initialize',
+                          'download',
+                          'mirror',
+                          'extract',
+                          'remote_extract',
+                          'merge',
+                          'convert',
+                          'aggregate',
+                          'process',
+                          'elected',
+                          'summarize']
     # Get the commands to run.
     commands_to_run = [command for command in available_commands if getattr(args, command)]
 
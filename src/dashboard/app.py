@@ -21,11 +21,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
-from src.dashboard.models.elections import Election
-from src.dashboard.utils.data_support import list_all_elections_files, load_election_data
+from src.dashboard.utils.data_support import list_all_election_years, load_party_counts
 from src.dashboard.utils.standard_elements import (dasboard_footer,
                                                    dashboard_banner,
                                                    setup_dashboard_configuration)
+from src.utils.parquet_dataset import DATASET_DIRECTORY
 
 
 @st.cache_resource
@@ -70,27 +70,24 @@ def main_page() -> None:
     # Display the header of the analysis.
     st.subheader('Análise dos Prefeitos Eleitos por Partido Político')
 
-    # List all election data files.
-    data_directory = 'data'
-    parquet_data_files = list_all_elections_files(data_directory)
+    # List all election years in the dataset.
+    dataset_directory = DATASET_DIRECTORY
+    election_years = list_all_election_years(dataset_directory)
 
-    # Load the election data from the parquet files.
-    all_elections_data = [load_election_data(file) for file in parquet_data_files]
+    # Query the number of mayors elected by party of each year.
+    all_party_counts = [load_party_counts(year, position='Prefeito') for year in election_years]
 
     # Create containers separated into tabs for each election year.
-    election_years = [year.split('.')[0].split('_')[-1] for year in parquet_data_files]
+    election_years = [str(year) for year in election_years]
     tabs = st.tabs(election_years)
 
     # Display the graphs of elected mayors by party for each election.
-    for index, election_data in enumerate(all_elections_data):
+    for index, party_counts in enumerate(all_party_counts):
         with tabs[index]:
-            if election_data.empty:
+            if party_counts.empty:
                 st.write('Os dados não foram carregados. Contate o administrador do sistema.')
                 continue
             else:
-                # Create an Election object for the mayoral election.
-                election = Election(election_data, position='Prefeito')
-                party_counts = election.count_by_party()
                 chart = create_bar_chart_party_counts(party_counts, election_years[index])
                 
                 # Display the bar chart with the number of mayors elected by party.
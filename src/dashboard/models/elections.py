@@ -18,68 +18,32 @@
 
 import pandas as pd
 
+from src.dashboard.utils.election_store import ElectionStore
+from src.utils.election_aggregates import SPECTRUM_TYPE
 
-class Election():
-    """Class to represent a municipal election."""
-
-    def __init__(self, data: pd.DataFrame, position: str = 'Prefeito') -> None:
-        self.__data = data
-        self.__position = position
-
-        # Filter the dataset by elected position.
-        self.__filter_data = self.__filter_elected_position()
 
-    def __filter_position(self) -> pd.DataFrame:
-        """Filter the dataset by a specific position.
-
-        Returns:
-            - DataFrame with only the selected position.
-        """
+class Election():
+    """Class to represent a municipal election.
 
-        return self.__data[self.__data['DS_CARGO'] == self.__position]
+    The data is queried from the election store, which returns only the rows
+    of each answer instead of the votes per zone of the whole year.
+    """
 
-    def __filter_elected_position(self) -> pd.DataFrame:
-        """Filter only elected mayors from the dataset.
+    def __init__(self, store: ElectionStore, year: int, position: str = 'Prefeito') -> None:
+        self.__store = store
+        self.__year = year
+        self.__position = position
 
-        Returns:
-            - DataFrame with only elected mayors.
-        """
+    @property
+    def filter_data(self) -> pd.DataFrame:
+        """Return the elected candidates of the position, one row per candidate."""
 
-        # Filter the dataset by the selected position.
-        position_df = self.__filter_position()
-        elected_position_df = position_df[position_df['DS_SIT_TOT_TURNO'] == 'ELEITO']
+        elected_candidates_df = self.__store.elected_candidates(self.__year, self.__position)
 
         # Convert the 'Espectro' column to a categorical and ordered type.
-        spectrum_type = pd.CategoricalDtype(categories=['Esquerda', 'Centro', 'Direita'], ordered=True)
-        elected_position_df['Espectro'] = elected_position_df.loc[:, 'Espectro'].astype(spectrum_type)
-
-        # Group the dataset by candidate and aggregate the votes.
-        aggregated_elected_candidates_df = (
-            elected_position_df.groupby('SQ_CANDIDATO')
-            .agg({'SG_UF': 'first',
-                  'SG_UE': 'first',
-                  'NM_UE': 'first',
-                  'CD_MUNICIPIO': 'first',
-                  'NM_MUNICIPIO': 'first',
-                  'SG_PARTIDO': 'first',
-                  'NR_PARTIDO': 'first',
-                  'NM_PARTIDO': 'first',
-                  'NR_CANDIDATO': 'first',
-                  'NM_CANDIDATO': 'first',
-                  'NM_URNA_CANDIDATO': 'first',
-                  'Espectro': 'first',
-                  'Espectro_Detalhado': 'first',
-                  'Posicionamento': 'first',
-                  'QT_VOTOS_NOMINAIS': 'sum'})
-            .reset_index())
-
-        return aggregated_elected_candidates_df
+        elected_candidates_df['Espectro'] = elected_candidates_df['Espectro'].astype(SPECTRUM_TYPE)
 
-    @property
-    def filter_data(self) -> pd.DataFrame:
-        """Return the filtered dataset."""
-
-        return self.__filter_data
+        return elected_candidates_df
 
     def count_by_party(self) -> pd.DataFrame:
         """Count the number of mayors elected by party.
@@ -88,11 +52,7 @@ class Election():
             - DataFrame with the number of mayors elected by party.
         """
 
-        party_counts = self.__filter_data['SG_PARTIDO'].value_counts().reset_index()
-        party_counts.columns = ['Partido', 'Quantidade']
-        party_counts = party_counts.sort_values(by='Quantidade', ascending=False)
-
-        return party_counts
+        return self.__store.party_counts(self.__year, self.__position)
 
     def top5_states_by_party(self) -> dict:
         """Get the top 5 states with the highest number of mayors elected per party.
@@ -101,13 +61,36 @@ class Election():
             - Dictionary where keys are party codes and values are DataFrames with top 5 states and their counts.
         """
 
-        parties = self.__filter_data['SG_PARTIDO'].unique()
+        return top5_states_by_party(self.__store.party_state_counts(self.__year, self.__position))
+
+    def spectrum_by_municipality(self) -> pd.DataFrame:
+        """Get the political spectrum of the mayor elected in each municipality.
+
+        Returns:
+            - DataFrame with one row per municipality.
+        """
+
+        spectrum_df = self.__store.municipal_spectrum(self.__year, self.__position)
+
+        # Convert the 'Espectro' column to a categorical and ordered type.
+        spectrum_df['Espectro'] = spectrum_df['Espectro'].astype(SPECTRUM_TYPE)
+
+        return spectrum_df
+
+
+def top5_states_by_party(party_state_counts: pd.DataFrame) -> dict:
+    """Split the counts by party and UF into the top 5 states of each party.
+
+    Arguments:
+        - party_state_counts: DataFrame with the number of mayors elected by party and state.
+
+    Returns:
+        - Dictionary where keys are party codes and values are DataFrames with top 5 states and their counts.
+    """
 
-        top5_dict = {}
-        for party in parties:
-            party_data = self.__filter_data[self.__filter_data['SG_PARTIDO'] == party]
-            state_counts = party_data['SG_UF'].value_counts().nlargest(5).reset_index()
-            state_counts.columns = ['Estado', 'Quantidade']
-            top5_dict[party] = state_counts
+    top5_dict = {}
+    for party, state_counts in party_state_counts.groupby('Partido', observed=True, sort=False):
+        state_counts = state_counts.nlargest(5, 'Quantidade')[['Estado', 'Quantidade']]
+        top5_dict[party] = state_counts.reset_index(drop=True)
 
-        return top5_dict
+    return top5_dict
@@ -22,13 +22,13 @@ import matplotlib.pyplot as plt
 from plotly import express as px
 from plotly import graph_objects as go
 
-from src.dashboard.models.elections import Election
-from src.dashboard.utils.data_support import (list_all_elections_files,
-                                              load_election_data,
+from src.dashboard.utils.data_support import (list_all_election_years,
+                                              load_municipal_spectrum,
                                               load_shapefile_data)
 from src.dashboard.utils.standard_elements import (dasboard_footer,
                                                    dashboard_banner,
                                                    setup_dashboard_configuration)
+from src.utils.parquet_dataset import DATASET_DIRECTORY
 
 
 @st.cache_resource
@@ -68,15 +68,15 @@ def comparison_political_alignment_page() -> None:
     # Display the header of the analysis.
     st.subheader('Comparação do Alinhamento Político dos Prefeitos Eleitos nas Eleições Municipais')
 
-    # List all election data files.
-    data_directory = 'data'
-    parquet_data_files = list_all_elections_files(data_directory)
+    # List all election years in the dataset.
+    dataset_directory = DATASET_DIRECTORY
+    election_years = list_all_election_years(dataset_directory)
 
-    # Load the election data from the parquet files.
-    all_elections_data = [load_election_data(file) for file in parquet_data_files]
+    # Query the spectrum of the mayor elected in each municipality of each year.
+    all_elections_data = [load_municipal_spectrum(year, position='Prefeito') for year in election_years]
 
     # Create containers separated into tabs for each election year.
-    election_years = [year.split('.')[0].split('_')[-1] for year in parquet_data_files]
+    election_years = [str(year) for year in election_years]
     tabs = st.tabs(election_years)
 
     # Load the geospatial simplifed data.
@@ -91,10 +91,6 @@ def comparison_political_alignment_page() -> None:
                 st.write('Os dados não foram carregados. Contate o administrador do sistema.')
                 continue
 
-            # Create an Election object for the mayoral election.
-            election = Election(election_data, position='Prefeito')
-            election_data = election.filter_data
-
             # Set the municipality name to uppercase.
             election_data['NM_MUNICIPIO'] = election_data['NM_UE'].str.upper()
 
@@ -16,45 +16,71 @@
 #  License: MIT
 # ------------------------------------------------------------------------------
 
-import glob
-
 import geopandas as gpd
 import pandas as pd
 import streamlit as st
 
+from src.dashboard.models.elections import Election
+from src.dashboard.utils.election_store import ElectionStore
+from src.utils.parquet_dataset import list_years
+
+
+@st.cache_resource
+def get_election_store() -> ElectionStore:
+    """Election store shared by all the sessions of the dashboard.
+
+    Returns:
+        - Election store over the Parquet outputs of the pipeline.
+    """
+
+    return ElectionStore()
+
 
 @st.cache_data
-def list_all_elections_files(data_directory: str,
-                             file_extension: str = 'parquet') -> list[glob.glob]:
-    """List all election data files from a directory.
+def load_party_counts(year: int, position: str = 'Prefeito') -> pd.DataFrame:
+    """Load the number of candidates elected by party in a year.
 
     Arguments:
-        - data_directory: Path to the directory with the election data files.
-        - file_extension: Extension of the election data files.
+        - year: Election year.
+        - position: Elected position.
 
     Returns:
-        - List with the available election data files.
+        - DataFrame with the number of candidates elected by party.
     """
 
-    # Find all file matching the pattern in the data directory.
-    file_pattern = f'{data_directory}/*.{file_extension}'
+    return Election(get_election_store(), year, position).count_by_party()
 
-    # Return the list of files in reverse order.
-    return glob.glob(file_pattern)[::-1]
+
+@st.cache_data
+def load_municipal_spectrum(year: int, position: str = 'Prefeito') -> pd.DataFrame:
+    """Load the political spectrum of the candidate elected in each municipality in a year.
+
+    Arguments:
+        - year: Election year.
+        - position: Elected position.
+
+    Returns:
+        - DataFrame with one row per municipality.
+    """
+
+    return Election(get_election_store(), year, position).spectrum_by_municipality()
 
 
 @st.cache_data
-def load_election_data(file_path: str) -> pd.DataFrame:
-    """Load the election data from a parquet file.
+def list_all_election_years(dataset_directory: str) -> list[int]:
+    """List the election years available in the dataset.
+
+    The years come from the names of the partition directories, so no data
+    file is opened.
 
     Arguments:
-        - file_path: Path to the parquet file.
+        - dataset_directory: Path to the partitioned election dataset.
 
     Returns:
-        - DataFrame with the election data.
+        - List with the available election years, the most recent first.
     """
 
-    return pd.read_parquet(file_path)
+    return list_years(dataset_directory)[::-1]
 
 
 @st.cache_data
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: election_store.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+import os
+
+import duckdb
+import pandas as pd
+
+from src.utils.elected_officials import ELECTED_AGGREGATIONS, ELECTED_DIRECTORY, elected_file_path
+from src.utils.election_aggregates import (AGGREGATES_DIRECTORY,
+                                           aggregate_file_path,
+                                           aggregates_version_directory)
+from src.utils.manifest import JsonManifest
+from src.utils.parquet_dataset import DATASET_DIRECTORY
+
+
+class ElectionStore():
+    """Query the Parquet outputs of the pipeline with an embedded DuckDB connection.
+
+    Projections, filters and groupings run in DuckDB, on all cores, and only
+    the result rows reach pandas. The tables materialized by the pipeline are
+    read when they exist; otherwise the answer is computed from the dataset.
+    """
+
+    def __init__(self,
+                 dataset_directory: str = DATASET_DIRECTORY,
+                 elected_directory: str = ELECTED_DIRECTORY,
+                 aggregates_directory: str = AGGREGATES_DIRECTORY) -> None:
+        self.__dataset_directory = dataset_directory
+        self.__elected_directory = elected_directory
+        self.__aggregates_directory = aggregates_directory
+
+        # Positions the aggregate tables of each year were materialized for.
+        self.__aggregates_manifest = JsonManifest(f'{aggregates_version_directory(aggregates_directory)}/manifest.json')
+
+        # One in-memory database per process; each query runs in its own cursor,
+        # so the sessions of the dashboard can share it.
+        self.__connection = duckdb.connect()
+
+    def __query(self, sql: str, parameters: list) -> pd.DataFrame:
+        """Run a query and return the result as a DataFrame."""
+
+        with self.__connection.cursor() as cursor:
+            return cursor.execute(sql, parameters).df()
+
+    def __dataset_source(self) -> str:
+        """Relation of the partitioned dataset, pruned by the filters on the partition columns."""
+
+        return (f"read_parquet('{self.__dataset_directory}/*/*/*.parquet', "
+                "hive_partitioning = true, "
+                "hive_types = {'ANO_ELEICAO': BIGINT, 'SG_UF': VARCHAR})")
+
+    def __materialized_table(self, table: str, year: int, position: str) -> str | None:
+        """Path of an aggregate table of the year, if it was materialized for the position."""
+
+        file_path = aggregate_file_path(self.__aggregates_directory, table, year)
+
+        if self.__aggregates_manifest.get(str(year)).get('position') != position or not os.path.exists(file_path):
+            return None
+
+        return file_path
+
+    def __elected_candidates(self, year: int, position: str) -> tuple[str, list]:
+        """Query of the elected candidates of a position, with the votes of all zones summed."""
+
+        file_path = elected_file_path(self.__elected_directory, position, year)
+        if os.path.exists(file_path):
+            return 'SELECT * FROM read_parquet(?)', [file_path]
+
+        # DuckDB sums integers as HUGEINT, which pandas receives as floats, so the sums keep
+        # the integer width of the QT_ columns, as in the elected candidates files.
+        columns = ', '.join(f'{aggregation}({column})::INTEGER AS {column}' if aggregation == 'sum'
+                            else f'{aggregation}({column}) AS {column}'
+                            for column, aggregation in ELECTED_AGGREGATIONS.items())
+
+        return (f'SELECT SQ_CANDIDATO, {columns} '
+                f'FROM {self.__dataset_source()} '
+                "WHERE ANO_ELEICAO = ? AND DS_CARGO = ? AND DS_SIT_TOT_TURNO = 'ELEITO' "
+                'GROUP BY SQ_CANDIDATO', [year, position])
+
+    def elected_candidates(self, year: int, position: str = 'Prefeito') -> pd.DataFrame:
+        """Elected candidates of a position in a year, one row per candidate.
+
+        Arguments:
+            - year: Election year.
+            - position: Elected position.
+        """
+
+        sql, parameters = self.__elected_candidates(year, position)
+
+        return self.__query(sql, parameters)
+
+    def party_counts(self, year: int, position: str = 'Prefeito') -> pd.DataFrame:
+        """Number of candidates elected by party, the largest first.
+
+        Arguments:
+            - year: Election year.
+            - position: Elected position.
+        """
+
+        file_path = self.__materialized_table('party_counts', year, position)
+        if file_path:
+            return self.__query('SELECT * FROM read_parquet(?)', [file_path])
+
+        sql, parameters = self.__elected_candidates(year, position)
+
+        return self.__query('SELECT SG_PARTIDO AS Partido, count(*) AS Quantidade '
+                            f'FROM ({sql}) '
+                            'GROUP BY SG_PARTIDO '
+                            'ORDER BY Quantidade DESC, Partido', parameters)
+
+    def party_state_counts(self, year: int, position: str = 'Prefeito') -> pd.DataFrame:
+        """Number of candidates elected by party and UF, the largest first within each party.
+
+        Arguments:
+            - year: Election year.
+            - position: Elected position.
+        """
+
+        file_path = self.__materialized_table('party_state_counts', year, position)
+        if file_path:
+            return self.__query('SELECT * FROM read_parquet(?)', [file_path])
+
+        sql, parameters = self.__elected_candidates(year, position)
+
+        return self.__query('SELECT SG_PARTIDO AS Partido, SG_UF AS Estado, count(*) AS Quantidade '
+                            f'FROM ({sql}) '
+                            'GROUP BY SG_PARTIDO, SG_UF '
+                            'ORDER BY Partido, Quantidade DESC, Estado', parameters)
+
+    def municipal_spectrum(self, year: int, position: str = 'Prefeito') -> pd.DataFrame:
+        """Political spectrum of the candidate elected in each municipality.
+
+        Arguments:
+            - year: Election year.
+            - position: Elected position.
+        """
+
+        file_path = self.__materialized_table('municipal_spectrum', year, position)
+        if file_path:
+            return self.__query('SELECT * FROM read_parquet(?)', [file_path])
+
+        sql, parameters = self.__elected_candidates(year, position)
+
+        return self.__query('SELECT SG_UF, CD_MUNICIPIO, NM_UE, SG_PARTIDO, Espectro '
+                            f'FROM ({sql}) '
+                            'ORDER BY SG_UF, CD_MUNICIPIO', parameters)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: converter.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+from abc import ABC, abstractmethod
+
+
+class ParquetConverterInterface(ABC):
+    @abstractmethod
+    def convert(self) -> None:
+        raise NotImplementedError('Method "convert" must be implemented.')
@@ -24,5 +24,6 @@ class DownloadManagerInterface(ABC):
 
     @abstractmethod
     def run(self, output_dir: str = 'downloads'):
+        """Download the files of all election years and return a DownloadReport."""
 
         raise NotImplementedError('Method "run" must be implemented.')
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: download_report.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+from threading import Lock
+from typing import List, NamedTuple
+
+
+class DownloadResult(NamedTuple):
+    """Outcome of the download of one election year."""
+
+    year: int
+    file_path: str
+    transferred_bytes: int = 0
+    elapsed_seconds: float = 0.0
+    error: str = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """Transfer rate in bytes per second."""
+
+        return self.transferred_bytes / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class DownloadReport:
+    """Collect the results of a download run."""
+
+    def __init__(self) -> None:
+        self.__results = []
+        self.__lock = Lock()
+
+    def add(self, result: DownloadResult) -> None:
+        with self.__lock:
+            self.__results.append(result)
+
+    @property
+    def results(self) -> List[DownloadResult]:
+        with self.__lock:
+            return sorted(self.__results, key=lambda result: result.year)
+
+    @property
+    def failures(self) -> List[DownloadResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    def summary(self) -> str:
+        """Return a table with the throughput of every year."""
+
+        lines = []
+        for result in self.results:
+            if result.succeeded:
+                lines.append(f'{result.year}: {result.transferred_bytes / 1024 ** 2:.1f} MiB in '
+                             f'{result.elapsed_seconds:.1f}s ({result.throughput / 1024 ** 2:.2f} MiB/s)')
+            else:
+                lines.append(f'{result.year}: FAILED - {result.error}')
+
+        return '\n'.join(lines)
@@ -22,9 +22,13 @@ from src.models.election_year_interface import ElectionYearInterface
 
 class ElectionYear(ElectionYearInterface):
 
-    def __init__(self, year: int = 2024):
+    def __init__(self, year: int = 2024, base_url: str = None):
         self.__year = year
 
+        # A mirror (http:// or file://) can replace the TSE CDN.
+        base_url = base_url or self.BASE_URL
+        self.__base_url = base_url if base_url.endswith('/') else f'{base_url}/'
+
     @property
     def year(self):
         return self.__year
@@ -33,8 +37,12 @@ class ElectionYear(ElectionYearInterface):
     def year(self, year):
         self.__year = year
 
+    @property
+    def base_url(self):
+        return self.__base_url
+
     def generate_url(self):
-        return f'{self.BASE_URL}votacao_candidato_munzona_{self.year}.zip'
+        return f'{self.base_url}votacao_candidato_munzona_{self.year}.zip'
 
     def file_name(self):
         return f'votacao_candidato_munzona_{self.year}.zip'
@@ -17,27 +17,48 @@
 # ------------------------------------------------------------------------------
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
+from functools import partial
 from typing import List
 
 from src.models.election_year import ElectionYear
-from src.services.commands import (DownloadCommand,
+from src.services.commands import (AggregatesCommand,
+                                   ConvertDataCommand,
+                                   DownloadCommand,
+                                   ElectedOfficialsCommand,
                                    ExtractDataCommand,
                                    FileAggregateCommand,
                                    FileProcessorCommand,
                                    InitializeCommand,
-                                   MergeDataCommand)
+                                   MergeDataCommand,
+                                   MirrorCommand,
+                                   RemoteExtractCommand)
+from src.services.aggregates_builder import AggregatesBuilder
+from src.services.async_download_manager import AsyncDownloadManager
 from src.services.download_manager import DownloadManager
+from src.services.elected_builder import ElectedOfficialsBuilder
 from src.services.extractor_manager import ExtractionManager
 from src.services.file_aggregator import FileAggregator
 from src.services.file_downloader import FileDownloader
 from src.services.file_processor import FileProcessor
+from src.services.parquet_converter import ParquetConverter
+from src.services.remote_zip import RemoteZipExtractor
 from src.services.transformer_csv import CVSTransformer
+from src.utils.bandwidth import BandwidthLimiter
 from src.utils.helpers import generate_election_years
+from src.utils.member_filter import MemberFilter
+from src.utils.parquet_dataset import DATASET_DIRECTORY, ParquetLayout
 
 
 class Pipeline:
     """Pipeline to download, extract, and transform data."""
 
+    # Commands executed when no command is given, in order.
+    DEFAULT_COMMANDS = ['initialize', 'download', 'extract', 'merge', 'aggregate', 'process', 'elected',
+                        'summarize']
+
+    # Without an extraction stage, the processor reads the downloaded archives directly.
+    ARCHIVE_COMMANDS = ['initialize', 'download', 'process', 'elected', 'summarize']
+
     def __init__(self,
                  start_year: int,
                  end_year: int,
@@ -45,7 +66,23 @@ class Pipeline:
                  extraction_dir: str,
                  transformer_dir: str,
                  aggregation_dir: str,
-                 output_file: str) -> None:
+                 output_file: str,
+                 download_engine: str = 'threads',
+                 max_bandwidth: float = None,
+                 years: List[int] = None,
+                 member_filter: MemberFilter = None,
+                 cache_dir: str = None,
+                 base_url: str = None,
+                 mirror_dir: str = 'mirror',
+                 from_archives: bool = False,
+                 validate_rows: bool = False,
+                 merge_workers: int = None,
+                 dataset_dir: str = DATASET_DIRECTORY,
+                 column_profile: str = 'full',
+                 chunk_size: int = None,
+                 process_workers: int = None,
+                 row_group_size: int = None,
+                 compression: str = None) -> None:
 
         # Defining the pipeline parameters.
         self.__start_year = start_year
@@ -55,25 +92,61 @@ class Pipeline:
         self.__transformer_dir = transformer_dir
         self.__aggregation_dir = aggregation_dir
         self.__output_file = output_file
+        self.__years = years or generate_election_years(self.__start_year, self.__end_year)
+        self.__member_filter = member_filter or MemberFilter()
+        self.__mirror_dir = mirror_dir
+        self.__from_archives = from_archives
+        self.__validate_rows = validate_rows
+        self.__dataset_dir = dataset_dir
+        self.__column_profile = column_profile
+        self.__layout = ParquetLayout(row_group_size or ParquetLayout().row_group_size,
+                                      compression or ParquetLayout().compression)
+
+        # Election years resolved against the configured base URL (TSE CDN or a mirror).
+        election_year = partial(ElectionYear, base_url=base_url)
+        self.__election_year = election_year
+
+        # Creating the file downloader, optionally capping the total bandwidth.
+        bandwidth_limiter = BandwidthLimiter(max_bandwidth) if max_bandwidth else None
+        self.__file_downloader = FileDownloader(bandwidth_limiter=bandwidth_limiter,
+                                                cache_dir=cache_dir)
 
-        # Creating the file downloader.
-        self.__file_downloader = FileDownloader()
+        # Creating the download manager with the selected engine.
+        download_managers = {'threads': DownloadManager, 'asyncio': AsyncDownloadManager}
+        if download_engine not in download_managers:
+            raise ValueError(f'Download engine "{download_engine}" is not valid. '
+                             f'Available engines: {list(download_managers.keys())}')
 
-        # Creating the download manager.
-        self.__download_manager = DownloadManager(ElectionYear,
-                                                  self.__file_downloader,
-                                                  self.__start_year,
-                                                  self.__end_year)
+        self.__download_manager = download_managers[download_engine](election_year,
+                                                                     self.__file_downloader,
+                                                                     self.__start_year,
+                                                                     self.__end_year)
+
+        # Creating the mirror manager, always synced from the TSE CDN and storing real files.
+        self.__mirror_manager = DownloadManager(partial(ElectionYear, base_url=ElectionYear.BASE_URL),
+                                                FileDownloader(bandwidth_limiter=bandwidth_limiter),
+                                                self.__start_year,
+                                                self.__end_year)
 
         # Creating the extractor manager.
-        self.__extractor = ExtractionManager()
+        self.__extractor = ExtractionManager(member_filter=self.__member_filter)
+
+        # Creating the extractor of selected members of the remote archives.
+        self.__remote_extractor = RemoteZipExtractor(election_year,
+                                                     self.__years,
+                                                     self.__member_filter)
 
         # Creating the file aggregator.
         self.__aggregator = FileAggregator(self.__transformer_dir,
                                            self.__aggregation_dir)
 
         # Creating the file processor.
-        self.__file_processor = FileProcessor()
+        self.__file_processor = FileProcessor(self.__member_filter,
+                                              self.__dataset_dir,
+                                              self.__column_profile,
+                                              chunk_size,
+                                              process_workers,
+                                              self.__layout)
 
         # Creating the transformer for each year in the pipeline.
         self.__transformer = self.__create_transformers()
@@ -86,13 +159,22 @@ class Pipeline:
                                              self.__aggregation_dir]),
             'download': DownloadCommand(self.__download_manager,
                                         self.__downloads_dir),
+            'mirror': MirrorCommand(self.__mirror_manager,
+                                    self.__mirror_dir),
             'extract': ExtractDataCommand(self.__extractor,
                                           self.__downloads_dir,
                                           self.__extraction_dir),
-            'merge': MergeDataCommand(self.__transformer),
+            'remote_extract': RemoteExtractCommand(self.__remote_extractor,
+                                                   self.__extraction_dir),
+            'merge': MergeDataCommand(self.__transformer, merge_workers),
+            'convert': ConvertDataCommand(self.__create_converters(),
+                                          self.__dataset_dir),
             'aggregate': FileAggregateCommand(self.__aggregator),
             'process': FileProcessorCommand(self.__file_processor,
-                                            self.__aggregation_dir)
+                                            self.__downloads_dir if self.__from_archives
+                                            else self.__aggregation_dir),
+            'elected': ElectedOfficialsCommand(ElectedOfficialsBuilder(self.__dataset_dir)),
+            'summarize': AggregatesCommand(AggregatesBuilder(self.__dataset_dir))
         }
 
     def __create_transformers(self) -> List[CVSTransformer]:
@@ -105,19 +187,49 @@ class Pipeline:
         transformers = []
 
         for year in generate_election_years(self.__start_year, self.__end_year):
-            # Input directory containing the csv files.
-            input_dir = f'{self.__extraction_dir}/{year}'
+            # Input directory (or downloaded archive) containing the csv files.
+            if self.__from_archives:
+                input_dir = f'{self.__downloads_dir}/{self.__election_year(year).file_name()}'
+            else:
+                input_dir = f'{self.__extraction_dir}/{year}'
             # Output directory for the transformed files.
-            output_dir = input_dir
+            output_dir = f'{self.__transformer_dir}/{year}'
             # Output file name.
             output_file = self.__output_file.format(year)
             # Creating the transformer.
             transformers.append(CVSTransformer(input_dir,
                                                output_dir,
-                                               output_file))
+                                               output_file,
+                                               self.__member_filter,
+                                               self.__validate_rows))
 
         return transformers
 
+    def __create_converters(self) -> List[ParquetConverter]:
+        """Create a list of Parquet converters for each year in the pipeline.
+
+        Returns:
+            List[ParquetConverter]: List of converters.
+        """
+
+        converters = []
+
+        for year in generate_election_years(self.__start_year, self.__end_year):
+            # Directory (or downloaded archive) containing the csv files.
+            if self.__from_archives:
+                input_dir = f'{self.__downloads_dir}/{self.__election_year(year).file_name()}'
+            else:
+                input_dir = f'{self.__extraction_dir}/{year}'
+            # Creating the converter.
+            converters.append(ParquetConverter(input_dir,
+                                               year,
+                                               self.__dataset_dir,
+                                               self.__member_filter,
+                                               column_profile=self.__column_profile,
+                                               layout=self.__layout))
+
+        return converters
+
     def run(self, commands_to_run: List[str] = None) -> None:
         """Executes one of the steps in the data pipeline.
 
@@ -130,9 +242,9 @@ class Pipeline:
 
         print('Running pipeline...')
 
-        # If not command to run, run all commands.
+        # If not command to run, run all default commands.
         if commands_to_run is None:
-            commands_to_run = list(self.__commands.keys())
+            commands_to_run = self.ARCHIVE_COMMANDS if self.__from_archives else self.DEFAULT_COMMANDS
 
         # Validating the commands.
         for command in commands_to_run:
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: aggregates_builder.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+import glob
+import os
+
+import pyarrow.dataset as ds
+
+from src.utils.elected_officials import ELECTED_COLUMNS, aggregate_elected_candidates
+from src.utils.election_aggregates import (AGGREGATES_DIRECTORY,
+                                           AGGREGATES_VERSION,
+                                           aggregate_file_path,
+                                           aggregates_version_directory,
+                                           count_by_party,
+                                           count_by_party_and_state,
+                                           spectrum_by_municipality,
+                                           votes_by_candidate)
+from src.utils.helpers import delete_file, make_directory
+from src.utils.manifest import JsonManifest
+from src.utils.parquet_dataset import DATASET_DIRECTORY, list_years, open_dataset
+
+
+class AggregatesBuilder:
+    """Materialize the aggregate tables of each year read by the dashboard.
+
+    The tables of a year are rebuilt only when a partition of the year is
+    newer than the build recorded in the manifest of the current version.
+    """
+
+    def __init__(self,
+                 dataset_dir: str = DATASET_DIRECTORY,
+                 aggregates_dir: str = AGGREGATES_DIRECTORY,
+                 position: str = 'Prefeito') -> None:
+        self.__dataset_dir = dataset_dir
+        self.__aggregates_dir = aggregates_dir
+        self.__position = position
+
+        self.__manifest = JsonManifest(f'{aggregates_version_directory(aggregates_dir)}/manifest.json')
+
+    def __source_mtime(self, year: int) -> float:
+        """Modification time of the newest partition of the year."""
+
+        partition_files = glob.glob(f'{self.__dataset_dir}/ANO_ELEICAO={year}/SG_UF=*/*.parquet')
+
+        return max((os.path.getmtime(partition_file) for partition_file in partition_files), default=0.0)
+
+    def __is_up_to_date(self, year: int) -> bool:
+        """Check if the tables of the year were built from the current partitions."""
+
+        entry = self.__manifest.get(str(year))
+        if not entry or entry.get('position') != self.__position:
+            return False
+
+        if not all(os.path.exists(aggregate_file_path(self.__aggregates_dir, table, year))
+                   for table in entry.get('tables', {})):
+            return False
+
+        return entry.get('source_mtime', 0.0) >= self.__source_mtime(year)
+
+    def __build_year(self, dataset: ds.Dataset, year: int) -> None:
+        """Write the aggregate tables of a year."""
+
+        source_mtime = self.__source_mtime(year)
+
+        voting_df = dataset.to_table(columns=ELECTED_COLUMNS,
+                                     filter=ds.field('ANO_ELEICAO') == year).to_pandas()
+        elected_df = aggregate_elected_candidates(voting_df, self.__position)
+
+        tables = {'party_counts': count_by_party(elected_df),
+                  'party_state_counts': count_by_party_and_state(elected_df),
+                  'municipal_spectrum': spectrum_by_municipality(elected_df),
+                  'candidate_votes': votes_by_candidate(voting_df)}
+
+        for table, table_df in tables.items():
+            file_path = aggregate_file_path(self.__aggregates_dir, table, year)
+            temporary_file_path = f'{file_path}.tmp'
+
+            try:
+                table_df.to_parquet(temporary_file_path, index=False)
+                os.replace(temporary_file_path, file_path)
+            except BaseException:
+                delete_file(temporary_file_path)
+                raise
+
+        self.__manifest.update(str(year), {'position': self.__position,
+                                           'source_mtime': source_mtime,
+                                           'tables': {table: len(table_df) for table, table_df in tables.items()}})
+
+        print(f'Aggregates of {year}: {", ".join(f"{table} ({len(table_df)})" for table, table_df in tables.items())}.')
+
+    def build(self) -> None:
+        """Build the aggregate tables of every year of the dataset."""
+
+        years = list_years(self.__dataset_dir)
+        if not years:
+            raise FileNotFoundError(f'No election year found in {self.__dataset_dir}.')
+
+        make_directory(aggregates_version_directory(self.__aggregates_dir))
+        dataset = open_dataset(self.__dataset_dir)
+
+        try:
+            for year in years:
+                if self.__is_up_to_date(year):
+                    print(f'The aggregates (v{AGGREGATES_VERSION}) of {year} are up to date.')
+                    continue
+
+                self.__build_year(dataset, year)
+        finally:
+            # The years already built are kept even if a later one fails.
+            self.__manifest.save()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: async_download_manager.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
+from tqdm import tqdm
+
+from src.interfaces.downloader import DownloadManagerInterface
+from src.models.download_report import DownloadReport, DownloadResult
+from src.models.election_year import ElectionYear
+from src.services.file_downloader import FileDownloader
+from src.utils.helpers import generate_election_years
+from src.utils.http_session import create_session, is_transient_error
+from src.utils.manifest import JsonManifest
+
+
+class AsyncDownloadManager(DownloadManagerInterface):
+    """Schedule the downloads of the election files from an asyncio event loop.
+
+    The transfers themselves are the blocking `requests` calls of the
+    FileDownloader, run in a thread pool; the event loop only decides when
+    each one starts. The number of simultaneous downloads starts low and is
+    adapted after each finished file: it grows while the aggregate throughput
+    keeps improving and shrinks when adding connections makes it worse.
+
+    Downloads failing with a transient error (connection errors, timeouts,
+    429 or 5xx responses) are retried with exponential backoff, on top of the
+    reconnections of the FileDownloader; other errors are reported at once.
+    """
+
+    def __init__(self,
+                 election_year: ElectionYear,
+                 file_downloader: FileDownloader,
+                 start_year: int,
+                 end_year: int,
+                 max_concurrency: int = 8,
+                 initial_concurrency: int = 2,
+                 max_attempts: int = 3) -> None:
+
+        if start_year > end_year:
+            raise ValueError('start_year must be less than or equal to end_year')
+
+        self.__election_year = election_year
+        self.__file_downloader = file_downloader
+
+        self.__start_year = start_year
+        self.__end_year = end_year
+        self.__max_concurrency = max_concurrency
+        self.__initial_concurrency = min(initial_concurrency, max_concurrency)
+        self.__max_attempts = max_attempts
+
+        # One connection pool shared by all the downloads.
+        self.__session = create_session(self.__max_concurrency)
+
+    async def __download_year(self,
+                              executor: ThreadPoolExecutor,
+                              year: int,
+                              output_dir: str,
+                              manifest: JsonManifest) -> DownloadResult:
+        """Download the file of one election year, retrying on failures."""
+
+        loop = asyncio.get_running_loop()
+        election_year = self.__election_year(year)
+        file_path = path.join(output_dir, election_year.file_name())
+        start_time = time.monotonic()
+
+        retrying = AsyncRetrying(stop=stop_after_attempt(self.__max_attempts),
+                                 wait=wait_exponential(multiplier=1, min=1, max=60),
+                                 retry=retry_if_exception(is_transient_error),
+                                 reraise=True)
+
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    transferred_bytes = await loop.run_in_executor(executor,
+                                                                   self.__file_downloader.download_file,
+                                                                   election_year.generate_url(),
+                                                                   file_path,
+                                                                   self.__session,
+                                                                   manifest)
+        except Exception as error:  # pylint: disable=broad-except
+            print(f'An unexpected error occurred {year}: {error}')
+            return DownloadResult(year, file_path, elapsed_seconds=time.monotonic() - start_time, error=str(error))
+
+        return DownloadResult(year, file_path, transferred_bytes, time.monotonic() - start_time)
+
+    def __adapt_concurrency(self, concurrency: int, throughput: float, previous_throughput: float) -> int:
+        """Increase or decrease the concurrency from the last observed throughput."""
+
+        # Nothing was transferred (e.g. the files were up to date), keep the current value.
+        if throughput <= 0 or previous_throughput <= 0:
+            return concurrency
+
+        if throughput > previous_throughput * 1.1:
+            return min(concurrency + 1, self.__max_concurrency)
+
+        if throughput < previous_throughput * 0.9:
+            return max(concurrency - 1, 1)
+
+        return concurrency
+
+    async def __run(self, output_dir: str) -> DownloadReport:
+
+        report = DownloadReport()
+        pending_years = deque(generate_election_years(self.__start_year, self.__end_year))
+        running_tasks = set()
+
+        concurrency = self.__initial_concurrency
+        previous_throughput = 0.0
+        window_start = time.monotonic()
+        window_bytes = 0
+
+        # Validators of the previous downloads, used to skip unchanged files.
+        manifest = JsonManifest(path.join(output_dir, 'manifest.json'))
+
+        progress_bar = tqdm(total=len(pending_years), desc='Downloading files')
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.__max_concurrency) as executor:
+                while pending_years or running_tasks:
+                    while pending_years and len(running_tasks) < concurrency:
+                        year = pending_years.popleft()
+                        running_tasks.add(asyncio.create_task(self.__download_year(executor,
+                                                                                   year,
+                                                                                   output_dir,
+                                                                                   manifest)))
+
+                    done_tasks, running_tasks = await asyncio.wait(running_tasks,
+                                                                   return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done_tasks:
+                        result = task.result()
+                        report.add(result)
+                        window_bytes += result.transferred_bytes
+                        progress_bar.update(1)
+
+                    # Aggregate throughput since the last adjustment.
+                    now = time.monotonic()
+                    throughput = window_bytes / (now - window_start) if now > window_start else 0.0
+
+                    if window_bytes > 0:
+                        concurrency = self.__adapt_concurrency(concurrency, throughput, previous_throughput)
+                        previous_throughput = throughput
+                        window_start = now
+                        window_bytes = 0
+        finally:
+            progress_bar.close()
+            manifest.save()
+
+        return report
+
+    def run(self, output_dir: str = 'downloads') -> DownloadReport:
+
+        return asyncio.run(self.__run(output_dir))
@@ -15,15 +15,24 @@
 # ------------------------------------------------------------------------------
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List
 
+from tqdm import tqdm
+
 from src.interfaces.controller import CommandInterface
-from src.services.download_manager import DownloadManager
+from src.interfaces.downloader import DownloadManagerInterface
+from src.services.aggregates_builder import AggregatesBuilder
+from src.services.elected_builder import ElectedOfficialsBuilder
 from src.services.extractor_manager import ExtractionManager
 from src.services.file_aggregator import FileAggregator
 from src.services.file_processor import FileProcessor
+from src.services.parquet_converter import ParquetConverter
+from src.services.remote_zip import RemoteZipExtractor
 from src.services.transformer_csv import CVSTransformer
 from src.utils.helpers import make_directory
+from src.utils.parquet_dataset import write_metadata
 
 
 class InitializeCommand(CommandInterface):
@@ -43,16 +52,46 @@ class DownloadCommand(CommandInterface):
     """Initialize the project and download the data."""
 
     def __init__(self,
-                 download_manager: DownloadManager,
+                 download_manager: DownloadManagerInterface,
                  output_dir: str):
 
         self.__download_manager = download_manager
         self.__output_dir = output_dir
 
     def execute(self) -> None:
-        """Execute the download command."""
+        """Execute the download command.
+
+        Raises:
+            RuntimeError: If any election year could not be downloaded.
+        """
+
+        report = self.__download_manager.run(self.__output_dir)
+        print(report.summary())
+
+        # Stop the pipeline before the next steps run on missing data.
+        if report.failures:
+            failed_years = [result.year for result in report.failures]
+            raise RuntimeError(f'Failed to download the election years: {failed_years}')
 
-        self.__download_manager.run(self.__output_dir)
+
+class MirrorCommand(CommandInterface):
+    """Sync the TSE archives into a local mirror directory."""
+
+    def __init__(self,
+                 download_manager: DownloadManagerInterface,
+                 mirror_dir: str):
+
+        self.__download_command = DownloadCommand(download_manager, mirror_dir)
+        self.__mirror_dir = mirror_dir
+
+    def execute(self) -> None:
+        """Execute the mirror command."""
+
+        make_directory(self.__mirror_dir)
+        self.__download_command.execute()
+
+        print(f'Mirror synced in {self.__mirror_dir}. Serve it over HTTP or use '
+              f'--base-url file://{os.path.abspath(self.__mirror_dir)}')
 
 
 class ExtractDataCommand(CommandInterface):
@@ -72,17 +111,113 @@ class ExtractDataCommand(CommandInterface):
         self.__extractor.extract_all_files(self.__output_dir, self.__extraction_dir)
 
 
+class RemoteExtractCommand(CommandInterface):
+    """Extract selected members straight from the remote archives."""
+
+    def __init__(self,
+                 remote_extractor: RemoteZipExtractor,
+                 extraction_dir: str):
+        self.__remote_extractor = remote_extractor
+        self.__extraction_dir = extraction_dir
+
+    def execute(self) -> None:
+        """Execute the remote extract command."""
+
+        self.__remote_extractor.extract_all_files(self.__extraction_dir)
+
+
 class MergeDataCommand(CommandInterface):
-    """Merge the extracted data."""
+    """Merge the extracted data.
+
+    Each year writes to its own output file, so the transformers run in a
+    process pool and the merge takes about as long as the largest year.
+    """
 
-    def __init__(self, transformers: List[CVSTransformer]):
+    def __init__(self, transformers: List[CVSTransformer], max_workers: int = None):
         self.transformers = transformers
+        self.__max_workers = max_workers
+
+    def execute(self) -> None:
+        """Execute the merge data command.
+
+        Raises:
+            RuntimeError: If any election year could not be merged.
+        """
+
+        failures = {}
+
+        with ProcessPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = {executor.submit(transformer.transform): transformer for transformer in self.transformers}
+
+            for future in tqdm(as_completed(futures), total=len(futures), desc='Merging files'):
+                output_file_path = futures[future].output_file_path
+
+                # A failing year is reported without stopping the other ones.
+                try:
+                    future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    print(f'An error occurred while merging {output_file_path}: {error}')
+                    failures[output_file_path] = error
+                else:
+                    print(f'{output_file_path} merged successfully.')
+
+        if failures:
+            raise RuntimeError(f'Failed to merge the files: {sorted(failures)}')
+
+
+class ConvertDataCommand(CommandInterface):
+    """Convert the per-UF CSV files of each year straight to the Parquet dataset."""
+
+    def __init__(self, converters: List[ParquetConverter], dataset_dir: str):
+        self.__converters = converters
+        self.__dataset_dir = dataset_dir
+
+    def execute(self) -> None:
+        """Execute the convert data command.
+
+        Raises:
+            RuntimeError: If any election year could not be converted.
+        """
+
+        failures = []
+
+        for converter in tqdm(self.__converters, desc='Converting files'):
+            # A failing year is reported without stopping the other ones.
+            try:
+                converter.convert()
+            except Exception as error:  # pylint: disable=broad-except
+                print(f'An error occurred while converting the election year {converter.year}: {error}')
+                failures.append(converter.year)
+
+        # Summarize the footers of all partitions for the readers.
+        write_metadata(self.__dataset_dir)
+
+        if failures:
+            raise RuntimeError(f'Failed to convert the election years: {failures}')
+
+
+class ElectedOfficialsCommand(CommandInterface):
+    """Build the elected candidates of each year for the dashboard."""
+
+    def __init__(self, elected_builder: ElectedOfficialsBuilder):
+        self.__elected_builder = elected_builder
+
+    def execute(self) -> None:
+        """Execute the elected officials command."""
+
+        self.__elected_builder.build()
+
+
+class AggregatesCommand(CommandInterface):
+    """Materialize the aggregate tables of each year for the dashboard."""
+
+    def __init__(self, aggregates_builder: AggregatesBuilder):
+        self.__aggregates_builder = aggregates_builder
 
     def execute(self) -> None:
-        """Execute the merge data command."""
+        """Execute the aggregates command."""
 
-        for transformer in self.transformers:
-            transformer.transform()
+        self.__aggregates_builder.build()
 
 
 class FileAggregateCommand(CommandInterface):
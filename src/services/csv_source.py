@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: csv_source.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+import glob
+import io
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, TextIO
+from zipfile import ZipFile
+
+from src.utils.member_filter import MemberFilter
+
+
+class CSVSource:
+    """Per-UF CSV files of one election year, read from a directory or a zip archive.
+
+    When the location is a `.zip` file, the members are decompressed on the fly
+    while they are read, so the data never has to be extracted to the disk.
+    """
+
+    def __init__(self, location: str, member_filter: MemberFilter = None) -> None:
+        self.__location = location
+        self.__member_filter = member_filter or MemberFilter()
+
+    @property
+    def location(self) -> str:
+        return self.__location
+
+    @property
+    def is_archive(self) -> bool:
+        return self.__location.lower().endswith('.zip')
+
+    def exists(self) -> bool:
+        """Check if the directory or archive exists."""
+
+        if self.is_archive:
+            return os.path.isfile(self.__location)
+
+        return os.path.isdir(self.__location)
+
+    def list_members(self) -> List[str]:
+        """List the selected CSV files (directory paths or archive member names)."""
+
+        if self.is_archive:
+            with ZipFile(self.__location, 'r') as zip_ref:
+                return self.__member_filter.select(zip_ref.namelist())
+
+        return self.__member_filter.select(sorted(glob.glob(f'{self.__location}/*')))
+
+    def last_modified(self, members: List[str]) -> float:
+        """Latest modification time of the given members, or of the archive holding them."""
+
+        if self.is_archive:
+            return os.path.getmtime(self.__location)
+
+        return max((os.path.getmtime(member) for member in members), default=0.0)
+
+    def fingerprint(self, members: List[str]) -> dict:
+        """Identity of the given members: size and CRC inside an archive, size and mtime on the disk."""
+
+        if self.is_archive:
+            with ZipFile(self.__location, 'r') as zip_ref:
+                return {member: {'size': zip_ref.getinfo(member).file_size, 'crc': zip_ref.getinfo(member).CRC}
+                        for member in members}
+
+        return {member: {'size': os.path.getsize(member), 'mtime': os.path.getmtime(member)}
+                for member in members}
+
+    @contextmanager
+    def open_binary(self, member: str) -> Iterator[BinaryIO]:
+        """Open a member as a binary stream."""
+
+        if self.is_archive:
+            with ZipFile(self.__location, 'r') as zip_ref, zip_ref.open(member) as file_object:
+                yield file_object
+        else:
+            with open(member, mode='rb') as file_object:
+                yield file_object
+
+    @contextmanager
+    def open_text(self, member: str, encoding: str = 'latin-1') -> Iterator[TextIO]:
+        """Open a member as a decoded text stream."""
+
+        with self.open_binary(member) as binary_file:
+            with io.TextIOWrapper(binary_file, encoding=encoding, newline='') as text_file:
+                yield text_file
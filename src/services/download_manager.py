@@ -17,15 +17,19 @@
 # ------------------------------------------------------------------------------
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from os import path
 
 from tqdm import tqdm
 
 from src.interfaces.downloader import DownloadManagerInterface
+from src.models.download_report import DownloadReport, DownloadResult
 from src.models.election_year import ElectionYear
 from src.services.file_downloader import FileDownloader
 from src.utils.helpers import generate_election_years
+from src.utils.http_session import create_session
+from src.utils.manifest import JsonManifest
 
 
 class DownloadManager(DownloadManagerInterface):
@@ -47,22 +51,47 @@ class DownloadManager(DownloadManagerInterface):
         self.__end_year = end_year
         self.__max_threads = max_threads
 
-    def run(self, output_dir: str = 'downloads'):
+        # One connection pool shared by all the download threads.
+        self.__session = create_session(self.__max_threads)
 
+    def __download_year(self, year: int, output_dir: str, manifest: JsonManifest) -> DownloadResult:
+        """Download the file of one election year and measure the transfer."""
+
+        election_year = self.__election_year(year)
+        file_path = path.join(output_dir, election_year.file_name())
+        start_time = time.monotonic()
+
+        transferred_bytes = self.__file_downloader.download_file(election_year.generate_url(),
+                                                                 file_path,
+                                                                 self.__session,
+                                                                 manifest)
+
+        return DownloadResult(year, file_path, transferred_bytes, time.monotonic() - start_time)
+
+    def run(self, output_dir: str = 'downloads') -> DownloadReport:
+
+        report = DownloadReport()
         election_years = generate_election_years(self.__start_year, self.__end_year)
 
-        with ThreadPoolExecutor(max_workers=self.__max_threads) as executor:
-            futures = {
-                executor.submit(
-                    self.__file_downloader.download_file,
-                    self.__election_year(year).generate_url(),
-                    path.join(output_dir, self.__election_year(year).file_name())
-                ): year for year in election_years
-            }
-
-            for future in tqdm(as_completed(futures), total=len(futures), desc='Downloading files'):
-                try:
-                    future.result()
-                except Exception as error:
+        # Validators of the previous downloads, used to skip unchanged files.
+        manifest = JsonManifest(path.join(output_dir, 'manifest.json'))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.__max_threads) as executor:
+                futures = {
+                    executor.submit(self.__download_year, year, output_dir, manifest): year
+                    for year in election_years
+                }
+
+                for future in tqdm(as_completed(futures), total=len(futures), desc='Downloading files'):
                     year = futures[future]
-                    print(f'An unexpected error occurred {year}: {error}')
+                    try:
+                        report.add(future.result())
+                    except Exception as error:  # pylint: disable=broad-except
+                        print(f'An unexpected error occurred {year}: {error}')
+                        file_path = path.join(output_dir, self.__election_year(year).file_name())
+                        report.add(DownloadResult(year, file_path, error=str(error)))
+        finally:
+            manifest.save()
+
+        return report
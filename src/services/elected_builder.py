@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: elected_builder.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+import glob
+import os
+
+import pyarrow.dataset as ds
+
+from src.utils.elected_officials import (ELECTED_COLUMNS,
+                                         ELECTED_DIRECTORY,
+                                         aggregate_elected_candidates,
+                                         elected_file_path)
+from src.utils.helpers import delete_file, make_directory
+from src.utils.parquet_dataset import DATASET_DIRECTORY, list_years, open_dataset
+
+
+class ElectedOfficialsBuilder:
+    """Build the elected candidates of each year from the voting dataset.
+
+    Each file has one row per elected candidate of the position, with the
+    votes of all zones summed and the party positions attached, so the
+    dashboard never reads the votes per zone.
+    """
+
+    def __init__(self,
+                 dataset_dir: str = DATASET_DIRECTORY,
+                 elected_dir: str = ELECTED_DIRECTORY,
+                 position: str = 'Prefeito') -> None:
+        self.__dataset_dir = dataset_dir
+        self.__elected_dir = elected_dir
+        self.__position = position
+
+    def __is_up_to_date(self, year: int) -> bool:
+        """Check if the file of the year is newer than all the partitions of the year."""
+
+        file_path = elected_file_path(self.__elected_dir, self.__position, year)
+        if not os.path.exists(file_path):
+            return False
+
+        partition_files = glob.glob(f'{self.__dataset_dir}/ANO_ELEICAO={year}/SG_UF=*/*.parquet')
+
+        return all(os.path.getmtime(file_path) >= os.path.getmtime(partition_file)
+                   for partition_file in partition_files)
+
+    def __build_year(self, dataset: ds.Dataset, year: int) -> None:
+        """Write the elected candidates of a year."""
+
+        # Only the rows of the position and the needed columns are read.
+        row_filter = (ds.field('ANO_ELEICAO') == year) & (ds.field('DS_CARGO') == self.__position)
+        voting_df = dataset.to_table(columns=ELECTED_COLUMNS, filter=row_filter).to_pandas()
+
+        elected_df = aggregate_elected_candidates(voting_df, self.__position)
+
+        file_path = elected_file_path(self.__elected_dir, self.__position, year)
+        temporary_file_path = f'{file_path}.tmp'
+
+        try:
+            elected_df.to_parquet(temporary_file_path, index=False)
+            os.replace(temporary_file_path, file_path)
+        except BaseException:
+            delete_file(temporary_file_path)
+            raise
+
+        print(f'{file_path}: {len(elected_df)} elected candidates.')
+
+    def build(self) -> None:
+        """Build the elected candidates of every year of the dataset."""
+
+        years = list_years(self.__dataset_dir)
+        if not years:
+            raise FileNotFoundError(f'No election year found in {self.__dataset_dir}.')
+
+        make_directory(self.__elected_dir)
+        dataset = open_dataset(self.__dataset_dir)
+
+        for year in years:
+            if self.__is_up_to_date(year):
+                print(f'The elected candidates of {year} are up to date.')
+                continue
+
+            self.__build_year(dataset, year)
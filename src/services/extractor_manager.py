@@ -18,44 +18,145 @@
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
 import glob
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from zipfile import BadZipFile, ZipFile
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List
+from zipfile import BadZipFile, ZipFile, ZipInfo
 
 from tqdm import tqdm
 
 from src.interfaces.extractor import ExtractionManagerInterface
-from src.utils.helpers import (delete_file,
-                               extract_year_from_zip_file_name,
-                               make_directory)
+from src.utils.helpers import extract_year_from_zip_file_name, make_directory
+from src.utils.manifest import JsonManifest
+from src.utils.member_filter import MemberFilter
+
+
+def check_member_crc(zip_file: str, member: str, chunk_size: int = 1024 * 1024) -> str:
+    """Inflate an archive member and check its CRC-32.
+
+    Returns:
+        str -- The error message, or None when the member is valid.
+    """
+
+    try:
+        with ZipFile(zip_file, 'r') as zip_ref, zip_ref.open(member) as member_file:
+            # The CRC-32 is checked by ZipExtFile when the end of the member is reached.
+            while member_file.read(chunk_size):
+                pass
+    except (BadZipFile, OSError, EOFError) as error:
+        return str(error)
+
+    return None
+
+
+def extract_members(zip_file: str, members: List[str], output_directory: str) -> None:
+    """Open an archive and inflate a subset of its members.
+
+    Runs in a worker process, so each worker decompresses its own members
+    without contending for the GIL.
+    """
+
+    with ZipFile(zip_file, 'r') as zip_ref:
+        for member in members:
+            zip_ref.extract(member, output_directory)
 
 
 class ExtractionManager(ExtractionManagerInterface):
+    """Extract the downloaded archives in a process pool, member by member.
+
+    Only the members accepted by the member filter are verified and written.
+    The CRC-32 and size of every extracted member are kept in
+    `<output_directory>/manifest.json`, so later runs only touch the members
+    that are new, changed or missing from the disk. Both come from the central
+    directory of the archive, so a new download of an unchanged archive does
+    not extract its members again.
+    """
+
+    def __init__(self,
+                 max_workers: int = None,
+                 verify_archives: bool = True,
+                 member_filter: MemberFilter = None) -> None:
+        self.__max_workers = max_workers or os.cpu_count()
+        self.__verify_archives = verify_archives
+        self.__member_filter = member_filter or MemberFilter()
+
+    def __is_extracted(self, member: ZipInfo, output_path: str, entry: dict) -> bool:
+        """Check if a member was already extracted and its output is still on disk."""
+
+        return (entry.get('crc') == member.CRC
+                and entry.get('size') == member.file_size
+                and os.path.isfile(output_path)
+                and os.path.getsize(output_path) == member.file_size)
+
+    def __find_corrupt_archives(self, tasks: list) -> dict:
+        """Check the CRC-32 of the members to be extracted, in parallel.
+
+        Returns:
+            dict -- Error messages of the corrupt archives, by file name.
+        """
+
+        corrupt_archives = {}
+
+        with ProcessPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = {
+                executor.submit(check_member_crc, task['zip_file'], task['member']): task
+                for task in tasks
+            }
 
-    def __init__(self, max_workers: int = 3) -> None:
-        self.__max_workers = max_workers
+            for future in tqdm(as_completed(futures), total=len(futures), desc='Verifying files'):
+                task = futures[future]
+                error = future.result()
+                if error is not None:
+                    corrupt_archives.setdefault(task['zip_file'], f'{task["member"]}: {error}')
 
-    def __extract_and_clean(self, zip_file: str, output_directory: str) -> None:
+        return corrupt_archives
 
-        try:
-            make_directory(output_directory)
-
-            with ZipFile(zip_file, 'r') as zip_ref:
-                print(f'Extracting {zip_file} to {output_directory}...')
-                zip_ref.extractall(output_directory)
-
-            readme_files = glob.glob(f'{output_directory}/*.pdf')
-            if readme_files:
-                for file in readme_files:
-                    print(f'Removing {file}...')
-                    delete_file(file)
-        except BadZipFile as error:
-            print(f'The file {zip_file} is corrupt or invalid.')
-            print(error)
-            raise
-        except Exception as error:
-            print(f'An error occurred while extracting {zip_file}.')
-            print(error)
-            raise
+    def __schedule_members(self,
+                           zip_files: List[str],
+                           output_directory: str,
+                           manifest: JsonManifest) -> list:
+        """List the extraction tasks, one per changed archive member, largest members first.
+
+        Scheduling the members instead of the archives spreads the large
+        archives over all the workers, so the biggest year does not run alone.
+
+        Raises:
+            BadZipFile: If an archive can not be opened.
+        """
+
+        tasks = []
+
+        for zip_file in zip_files:
+            year = extract_year_from_zip_file_name(zip_file)
+            year_directory = f'{output_directory}/{year}'
+            skipped_members = 0
+
+            try:
+                with ZipFile(zip_file, 'r') as zip_ref:
+                    members = [member for member in zip_ref.infolist()
+                               if not member.is_dir() and self.__member_filter.matches(member.filename)]
+            except BadZipFile as error:
+                print(f'The file {zip_file} is corrupt or invalid.')
+                print(error)
+                raise
+
+            for member in members:
+                key = f'{year}/{member.filename}'
+
+                if self.__is_extracted(member, os.path.join(year_directory, member.filename), manifest.get(key)):
+                    skipped_members += 1
+                    continue
+
+                tasks.append({'key': key,
+                              'zip_file': zip_file,
+                              'member': member.filename,
+                              'year_directory': year_directory,
+                              'entry': {'crc': member.CRC, 'size': member.file_size}})
+
+            if skipped_members:
+                print(f'{zip_file}: {skipped_members} members already extracted and unchanged.')
+
+        return sorted(tasks, key=lambda task: task['entry']['size'], reverse=True)
 
     def extract_all_files(self, source_directory: str, output_directory: str) -> None:
 
@@ -65,18 +166,56 @@ class ExtractionManager(ExtractionManagerInterface):
             print(f'No compressed files found in {source_directory}.')
             return
 
-        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
-            futures = {
-                executor.submit(
-                    self.__extract_and_clean,
-                    zip_file,
-                    f'{output_directory}/{extract_year_from_zip_file_name(zip_file)}',
-                ): zip_file for zip_file in zip_files
-            }
+        make_directory(output_directory)
+        manifest = JsonManifest(f'{output_directory}/manifest.json')
+
+        tasks = self.__schedule_members(zip_files, output_directory, manifest)
+
+        if not tasks:
+            print('All selected members are already extracted and up to date.')
+            return
 
-            for future in tqdm(as_completed(futures), total=len(futures), desc='Extracting files'):
-                year = futures[future]
-                future.result()
-                print(f'Extraction of {year} completed successfully.')
+        # Reject corrupt downloads before spending an extraction pass on them.
+        if self.__verify_archives:
+            corrupt_archives = self.__find_corrupt_archives(tasks)
+            if corrupt_archives:
+                for zip_file, error in corrupt_archives.items():
+                    print(f'The file {zip_file} is corrupt or invalid: {error}')
+                raise BadZipFile(f'Corrupt archives: {sorted(corrupt_archives)}. Download them again.')
+
+        pending_members = {}
+        for task in tasks:
+            make_directory(task['year_directory'])
+            pending_members[task['zip_file']] = pending_members.get(task['zip_file'], 0) + 1
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.__max_workers) as executor:
+                futures = {
+                    executor.submit(extract_members, task['zip_file'], [task['member']], task['year_directory']): task
+                    for task in tasks
+                }
+
+                for future in tqdm(as_completed(futures), total=len(futures), desc='Extracting files'):
+                    task = futures[future]
+                    zip_file = task['zip_file']
+
+                    try:
+                        future.result()
+                    except BadZipFile as error:
+                        print(f'The file {zip_file} is corrupt or invalid.')
+                        print(error)
+                        raise
+                    except Exception as error:
+                        print(f'An error occurred while extracting {zip_file}.')
+                        print(error)
+                        raise
+
+                    manifest.update(task['key'], task['entry'])
+
+                    pending_members[zip_file] -= 1
+                    if pending_members[zip_file] == 0:
+                        print(f'Extraction of {zip_file} completed successfully.')
+        finally:
+            manifest.save()
 
         print('All files extracted successfully.')
@@ -17,13 +17,22 @@
 # ------------------------------------------------------------------------------
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
-import shutil
 import glob
+import os
+import shutil
+from collections import Counter
 
 from src.interfaces.aggregator import FileAggregatorInterface
+from src.utils.helpers import link_or_copy
 
 
 class FileAggregator(FileAggregatorInterface):
+    """Gather the merged CSV files of all years in the output directory.
+
+    The files are linked instead of copied: hard links (or reflinks) when
+    both directories share a filesystem and symbolic links otherwise, so the
+    step costs no disk space nor a read and write of every file.
+    """
 
     def __init__(self, input_dir: str, output_dir: str) -> None:
         self.__input_dir = input_dir
@@ -51,8 +60,19 @@ class FileAggregator(FileAggregatorInterface):
         if not agregated_files:
             raise FileNotFoundError(f'No CSV files found in {self.__input_dir}.')
 
+        strategies = Counter()
+
         for file in agregated_files:
+            target = os.path.join(self.__output_dir, os.path.basename(file))
+
+            # Already linked by a previous run.
+            if os.path.exists(target) and os.path.samefile(file, target):
+                strategies['unchanged'] += 1
+                continue
+
             try:
-                shutil.copy(file, self.__output_dir)
-            except shutil.Error as error:
-                print(f'Error copying file: {error}')
+                strategies[link_or_copy(file, target)] += 1
+            except (OSError, shutil.Error) as error:
+                print(f'Error linking file: {error}')
+
+        print(f'Aggregated files: {dict(strategies)}')
@@ -17,40 +17,346 @@
 # ------------------------------------------------------------------------------
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
+import hashlib
+import json
+import os
+import shutil
 from os import path
 
 import requests
 
 from src.interfaces.file_handler import FileDownloaderInterface
+from src.utils.bandwidth import BandwidthLimiter
+from src.utils.helpers import delete_file, link_or_copy, make_directory
+from src.utils.manifest import JsonManifest
 
 
 class FileDownloader(FileDownloaderInterface):
+    """Download files keeping a resumable partial copy on disk.
 
-    def download_file(self, url: str, file_path: str):
-        """Download a file from a URL and save it to a local file path."""
+    The data is written to a `<file>.part` file and the number of bytes safely
+    stored is kept in a `<file>.part.json` sidecar. When the connection drops,
+    the download is resumed with a `Range` request from the recorded offset.
+
+    When a manifest is given, the validators of every finished download (ETag,
+    Last-Modified and size) are recorded so that the next run can check the
+    remote file with a conditional `HEAD` request instead of downloading it.
+
+    The SHA-256 digest of the file is computed while the stream is written.
+    With a cache directory, finished files are stored there by digest
+    (`<cache_dir>/<sha[:2]>/<sha>.zip`) and the local file path becomes a link
+    to the cached copy, so several checkouts can share the same archives.
+    """
+
+    def __init__(self,
+                 timeout: int = 10,
+                 chunk_size: int = 8192,
+                 max_attempts: int = 5,
+                 checkpoint_size: int = 8 * 1024 * 1024,
+                 bandwidth_limiter: BandwidthLimiter = None,
+                 cache_dir: str = None) -> None:
+        self.__timeout = timeout
+        self.__chunk_size = chunk_size
+        self.__max_attempts = max_attempts
+        self.__checkpoint_size = checkpoint_size
+        self.__bandwidth_limiter = bandwidth_limiter
+        self.__cache_dir = cache_dir
+
+    def __load_state(self, url: str, part_path: str, state_path: str) -> dict:
+        """Load the sidecar state of a partial download.
+
+        A partial file without a valid sidecar (or from another URL) can not be
+        trusted, so it is discarded and the download starts from zero.
+        """
+
+        state = {}
+
+        if path.exists(part_path) and path.exists(state_path):
+            try:
+                with open(state_path, mode='r', encoding='utf-8') as file_object:
+                    state = json.load(file_object)
+            except (IOError, ValueError):
+                state = {}
+
+        if not state or state.get('url') != url or state.get('offset', 0) > path.getsize(part_path):
+            delete_file(part_path)
+            delete_file(state_path)
+            return {'url': url, 'offset': 0}
+
+        # Drop any byte written after the last checkpoint.
+        with open(part_path, mode='r+b') as file_object:
+            file_object.truncate(state['offset'])
+
+        return state
+
+    def __save_state(self, state: dict, state_path: str) -> None:
+        """Persist the sidecar state of a partial download."""
+
+        with open(state_path, mode='w', encoding='utf-8') as file_object:
+            json.dump(state, file_object)
+
+    def __hash_file(self, file_path: str, size: int):
+        """Hash the first `size` bytes of a file.
+
+        Only needed when resuming a partial file left by a previous run, since
+        the digest of the bytes already stored can not be saved in the sidecar.
+        """
+
+        digest = hashlib.sha256()
+
+        with open(file_path, mode='rb') as file_object:
+            remaining = size
+            while remaining > 0:
+                chunk = file_object.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+
+        return digest
+
+    def __store_file(self, part_path: str, file_path: str, sha256: str) -> None:
+        """Move the finished file into place, through the cache when enabled."""
+
+        if self.__cache_dir is None:
+            os.replace(part_path, file_path)
+            return
+
+        cache_path = path.join(self.__cache_dir, sha256[:2], f'{sha256}{path.splitext(file_path)[1]}')
+
+        if path.exists(cache_path):
+            # Another checkout already stored the same content.
+            delete_file(part_path)
+        else:
+            make_directory(path.dirname(cache_path))
+            temporary_path = f'{cache_path}.{os.getpid()}.tmp'
+            shutil.move(part_path, temporary_path)
+            os.replace(temporary_path, cache_path)
+
+        # A symbolic link keeps the cache entry shared by all the checkouts.
+        link_or_copy(cache_path, file_path, ['symlink', 'hardlink'])
+
+    def __is_up_to_date(self,
+                        http: requests.Session,
+                        url: str,
+                        file_path: str,
+                        manifest: JsonManifest) -> bool:
+        """Check with a HEAD request if the local file matches the remote one."""
+
+        entry = manifest.get(path.basename(file_path)) if manifest is not None else {}
+        local_size = path.getsize(file_path)
+
+        headers = {}
+        if entry.get('size') == local_size:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = http.head(url, headers=headers, timeout=self.__timeout, allow_redirects=True)
+
+        if response.status_code == 304:
+            return True
+
+        response.raise_for_status()
+
+        remote_size = int(response.headers.get('content-length', -1))
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+
+        if remote_size != local_size:
+            return False
+
+        # Without a previous entry, the size is the only thing to compare.
+        if entry and (etag, last_modified) != (entry.get('etag'), entry.get('last_modified')):
+            return False
+
+        if manifest is not None:
+            manifest.update(path.basename(file_path), {'url': url,
+                                                       'size': remote_size,
+                                                       'etag': etag,
+                                                       'last_modified': last_modified})
+
+        return True
+
+    def __request(self, http: requests.Session, url: str, state: dict) -> requests.Response:
+        """Open the download stream, asking for the missing bytes when possible."""
+
+        headers = {}
+
+        if state['offset'] > 0 and state.get('accept_ranges', False):
+            headers['Range'] = f'bytes={state["offset"]}-'
+
+            # Only resume if the remote file is still the same one.
+            validator = state.get('etag') or state.get('last_modified')
+            if validator:
+                headers['If-Range'] = validator
+
+        return http.get(url, headers=headers, timeout=self.__timeout, stream=True)
+
+    def __is_resumed(self, response: requests.Response, state: dict) -> bool:
+        """Check if the server answered with the requested byte range."""
+
+        if state['offset'] == 0 or response.status_code != 206:
+            return False
+
+        content_range = response.headers.get('content-range', '')
+
+        return content_range.startswith(f'bytes {state["offset"]}-')
+
+    def __reset_state(self, response: requests.Response, state: dict) -> None:
+        """Restart the partial download from the response of a full fetch."""
+
+        state['offset'] = 0
+        state['total'] = int(response.headers.get('content-length', 0)) or None
+        state['etag'] = response.headers.get('etag')
+        state['last_modified'] = response.headers.get('last-modified')
+        state['accept_ranges'] = response.headers.get('accept-ranges', '').lower() == 'bytes'
+
+    def __write_stream(self,
+                       response: requests.Response,
+                       part_path: str,
+                       state_path: str,
+                       state: dict,
+                       resumed: bool,
+                       digest) -> None:
+        """Write the response body to the partial file, checkpointing the offset."""
+
+        unsaved_bytes = 0
+
+        with open(part_path, mode='ab' if resumed else 'wb') as file_object:
+            try:
+                for chunk in response.iter_content(chunk_size=self.__chunk_size):
+                    if not chunk:
+                        continue
+
+                    if self.__bandwidth_limiter is not None:
+                        self.__bandwidth_limiter.consume(len(chunk))
+
+                    file_object.write(chunk)
+                    digest.update(chunk)
+                    state['offset'] += len(chunk)
+                    unsaved_bytes += len(chunk)
+
+                    if unsaved_bytes >= self.__checkpoint_size:
+                        file_object.flush()
+                        self.__save_state(state, state_path)
+                        unsaved_bytes = 0
+            finally:
+                file_object.flush()
+                self.__save_state(state, state_path)
+
+    def download_file(self,
+                      url: str,
+                      file_path: str,
+                      session: requests.Session = None,
+                      manifest: JsonManifest = None) -> int:
+        """Download a file from a URL and save it to a local file path.
+
+        Arguments:
+            url {str} -- URL of the remote file.
+            file_path {str} -- Local path of the downloaded file.
+            session {requests.Session} -- Session used to reuse connections. Defaults to None.
+            manifest {JsonManifest} -- Manifest with the validators of the downloads. Defaults to None.
+
+        Returns:
+            int -- Number of bytes received, 0 when the local file is up to date.
+
+        Raises:
+            requests.exceptions.RequestException: If the download fails.
+            IOError: If the downloaded file can not be written or is incomplete.
+        """
+
+        http = session if session is not None else requests
+        part_path = f'{file_path}.part'
+        state_path = f'{part_path}.json'
+        received_bytes = 0
+        digest = None
 
         try:
-            response = requests.get(url, timeout=10, stream=True)
-            response.raise_for_status()
+            state = self.__load_state(url, part_path, state_path)
+
+            if state['offset'] == 0 and path.exists(file_path):
+                if self.__is_up_to_date(http, url, file_path, manifest):
+                    print(f'{file_path} is up to date with the remote file.')
+                    return 0
+
+            for attempt in range(1, self.__max_attempts + 1):
+                write_start = state['offset']
+
+                try:
+                    response = self.__request(http, url, state)
+
+                    if response.status_code == 416:
+                        response.close()
+
+                        # The whole remote file is already stored in the partial file.
+                        if state['offset'] == state.get('total'):
+                            break
+
+                        # The stored range is no longer valid, so fetch the whole file.
+                        state['offset'] = 0
+                        state['accept_ranges'] = False
+                        continue
+
+                    response.raise_for_status()
+
+                    resumed = self.__is_resumed(response, state)
+                    if not resumed:
+                        self.__reset_state(response, state)
+                        write_start = 0
+                        digest = hashlib.sha256()
+                    else:
+                        print(f'Resuming {file_path} from byte {state["offset"]}...')
+
+                        # Within this call the digest always covers the stored bytes.
+                        if digest is None:
+                            digest = self.__hash_file(part_path, state['offset'])
+
+                    self.__write_stream(response, part_path, state_path, state, resumed, digest)
+                    received_bytes += state['offset'] - write_start
+                    break
+                except (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError) as connection_error:
+                    received_bytes += max(state['offset'] - write_start, 0)
+
+                    if attempt == self.__max_attempts:
+                        raise
+
+                    print(f'Connection lost downloading {file_path} at byte {state["offset"]} '
+                          f'(attempt {attempt}/{self.__max_attempts}): {connection_error}')
+
+                    if not state.get('accept_ranges', False):
+                        state['offset'] = 0
+
+            if state.get('total') and state['offset'] != state['total']:
+                raise IOError(f'{part_path} has {state["offset"]} bytes, expected {state["total"]}.')
+
+            if digest is None:
+                digest = self.__hash_file(part_path, state['offset'])
 
-            if path.exists(file_path):
-                file_size_local = path.getsize(file_path)
-                file_size_remote = int(response.headers.get('content-length', 0))
+            sha256 = digest.hexdigest()
+            self.__store_file(part_path, file_path, sha256)
+            delete_file(state_path)
 
-                if file_size_remote == file_size_local:
-                    print(f'{file_path} already exists and has the same size as the remote file.')
-                    return
+            if manifest is not None:
+                manifest.update(path.basename(file_path), {'url': url,
+                                                           'size': path.getsize(file_path),
+                                                           'etag': state.get('etag'),
+                                                           'last_modified': state.get('last_modified'),
+                                                           'sha256': sha256})
 
-            with open(file_path, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        file.write(chunk)
+            return received_bytes
         except requests.exceptions.HTTPError as http_error:
             print(f'HTTP Error: {http_error}')
+            raise
         except requests.exceptions.RequestException as request_exception:
             print(f'Request Exception: {request_exception}')
+            raise
         except IOError as io_error:
             print(f'Input/Output Error: {io_error}')
+            raise
         except Exception as error:  # pylint: disable=broad-except
             print(f'Unexpected error: {error}')
             raise error
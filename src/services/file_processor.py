@@ -18,80 +18,205 @@
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
 import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List
+from zipfile import ZipFile
 
 import pandas as pd
+import pyarrow as pa
+from tqdm import tqdm
 
 from src.interfaces.processor import FileProcessorInterface
+from src.services.csv_source import CSVSource
+from src.utils.column_profiles import COLUMN_PROFILES, validate_column_profile
+from src.utils.helpers import available_memory
+from src.utils.member_filter import MemberFilter
+from src.utils.parquet_dataset import DATASET_DIRECTORY, ParquetLayout, PartitionWriter, write_metadata
+from src.utils.party_lineage import attach_party_positions
+from src.utils.tse_schema import cast_to_tse_schema, text_column_dtypes
 
 
 class FileProcessor(FileProcessorInterface):
-    """Process files with voting data."""
+    """Process files with voting data.
 
-    def __get_csv_files(self, source_directory: str, extension: str = '*.csv',) -> list:
-        """Get all CSV files in the source directory."""
+    The source directory may hold merged CSV files or the downloaded zip
+    archives, whose selected members are parsed straight from the archive.
+    The processed data is written to the `ANO_ELEICAO=/SG_UF=` partitions of
+    the dataset, keeping only the columns of the column profile, which are
+    selected by the parser itself.
 
-        return glob.glob(f'{source_directory}/{extension}')
+    With a `chunk_size`, each file is read in chunks of that many rows and
+    every chunk is appended as row groups to the partitions, so the memory use
+    is bounded by the chunk size instead of the size of the year.
 
-    def __load_csv_file(self, file_path: str) -> pd.DataFrame:
-        """Load a CSV file into a pandas DataFrame."""
+    The files (one per year) are processed in a process pool. The number of
+    workers is bounded by the available memory divided by the estimated peak
+    memory of the largest file, so the largest years never run out of memory.
+    """
 
-        return pd.read_csv(file_path, sep=';', encoding='latin-1')
+    # Estimated peak memory of pandas per byte of CSV, and bytes per CSV row.
+    MEMORY_PER_CSV_BYTE = 4
+    CSV_BYTES_PER_ROW = 512
 
-    def __fetch_brazilian_party_positions(self) -> pd.DataFrame:
-        """Load positions of Brazilian parties."""
+    def __init__(self,
+                 member_filter: MemberFilter = None,
+                 dataset_dir: str = DATASET_DIRECTORY,
+                 column_profile: str = 'full',
+                 chunk_size: int = None,
+                 max_workers: int = None,
+                 layout: ParquetLayout = None) -> None:
+        self.__member_filter = member_filter or MemberFilter()
+        self.__dataset_dir = dataset_dir
+        self.__column_profile = validate_column_profile(column_profile)
+        self.__usecols = COLUMN_PROFILES[column_profile]
+        self.__chunk_size = chunk_size
+        self.__max_workers = max_workers or os.cpu_count()
+        self.__layout = layout
 
-        return pd.read_csv('data/positions_brazilian_parties.csv', sep=';')
+    def __get_csv_files(self, source_directory: str, extensions: tuple = ('*.csv', '*.zip')) -> list:
+        """Get all CSV files and zip archives in the source directory."""
+
+        return [file_path for extension in extensions for file_path in glob.glob(f'{source_directory}/{extension}')]
+
+    def __read_text_dtypes(self, file_object) -> dict:
+        """Read the header of a CSV file and return the dtypes of its text columns."""
+
+        column_names = pd.read_csv(file_object, sep=';', encoding='latin-1', nrows=0).columns
+
+        # The same stream is read again from the start.
+        if not isinstance(file_object, str):
+            file_object.seek(0)
+
+        return text_column_dtypes(column_names)
+
+    def __read_csv_chunks(self, file_object) -> Iterator[pd.DataFrame]:
+        """Read a CSV file whole, or in chunks of `chunk_size` rows."""
+
+        dtypes = self.__read_text_dtypes(file_object)
+
+        if self.__chunk_size is None:
+            yield pd.read_csv(file_object, sep=';', encoding='latin-1', usecols=self.__usecols, dtype=dtypes)
+            return
+
+        with pd.read_csv(file_object,
+                         sep=';',
+                         encoding='latin-1',
+                         usecols=self.__usecols,
+                         dtype=dtypes,
+                         chunksize=self.__chunk_size) as csv_reader:
+            yield from csv_reader
+
+    def __load_csv_file(self, file_path: str) -> Iterator[pd.DataFrame]:
+        """Load a CSV file, or the selected members of a zip archive, into pandas DataFrames."""
+
+        if not file_path.lower().endswith('.zip'):
+            yield from self.__read_csv_chunks(file_path)
+            return
+
+        source = CSVSource(file_path, self.__member_filter)
+        members = source.list_members()
+
+        if not members:
+            raise FileNotFoundError(f'No CSV member of {file_path} matches the member filter.')
+
+        for member in members:
+            with source.open_binary(member) as member_file:
+                yield from self.__read_csv_chunks(member_file)
 
     def __integrate_brazilian_party_roles(self, dataframe: pd.DataFrame) -> pd.DataFrame:
 
-        # Load positions of Brazilian parties.
-        positions_brazilian_parties_df = self.__fetch_brazilian_party_positions()
+        # Merge positions of Brazilian parties, resolved through their lineages, with the DataFrame.
+        return attach_party_positions(dataframe, 'data/positions_brazilian_parties.csv')
+
+    def __estimate_memory(self, file_path: str) -> int:
+        """Estimate the peak memory, in bytes, used to process a file."""
+
+        if file_path.lower().endswith('.zip'):
+            with ZipFile(file_path, 'r') as zip_ref:
+                csv_size = sum(member.file_size for member in zip_ref.infolist()
+                               if self.__member_filter.matches(member.filename))
+        else:
+            csv_size = os.path.getsize(file_path)
+
+        if self.__chunk_size is not None:
+            csv_size = min(csv_size, self.__chunk_size * self.CSV_BYTES_PER_ROW)
+
+        return csv_size * self.MEMORY_PER_CSV_BYTE
 
-        # Merge positions of Brazilian parties with the DataFrame.
-        dataframe = pd.merge(dataframe,
-                             positions_brazilian_parties_df,
-                             left_on='SG_PARTIDO',
-                             right_on='SG_PARTIDO',
-                             how='left')
+    def __count_workers(self, memory_estimates: List[int]) -> int:
+        """Number of workers that fit in the available memory, processing the largest files at once."""
 
-        return dataframe
+        workers = min(self.__max_workers, len(memory_estimates))
+        memory = available_memory()
 
-    def __save_processed_data(self,
-                              dataframe: pd.DataFrame,
-                              data_directory: str,
-                              file_name: str,
-                              file_type: str = 'parquet') -> None:
-        """Save the processed DataFrame."""
+        if memory is not None and memory_estimates:
+            workers = min(workers, memory // max(max(memory_estimates), 1))
+
+        return max(workers, 1)
+
+    def save_processed_data(self, file_path: str) -> None:
+        """Save the processed DataFrames of a file to the partitions of their years and states."""
+
+        partition_writer = None
 
         try:
-            if file_type == 'parquet':
-                dataframe.to_parquet(
-                    f'{data_directory}/{file_name}.parquet', index=False)
-            else:
-                dataframe.to_csv(f'{data_directory}/{file_name}.csv',
-                                 index=False,
-                                 sep=';',
-                                 encoding='utf-8')
-        except IOError as error:
-            print(f'Error saving the processed data: {file_name}.{file_type}')
-            print(f'Error: {error}')
+            for voting_df in self.__load_csv_file(file_path):
+                # Merge positions of Brazilian parties with the DataFrame.
+                voting_df = self.__integrate_brazilian_party_roles(voting_df)
 
-    def process_file(self, source_directory: str) -> None:
-        """Process a file with voting data."""
+                # The same schema as the convert step, so both can share the dataset.
+                table = cast_to_tse_schema(pa.Table.from_pandas(voting_df, preserve_index=False))
 
-        for file_path in self.__get_csv_files(source_directory):
-            # Get the file name to save the processed data.
-            file_name = file_path.split('\\')[-1].split('.')[0]
-            print(f'Processing file: {file_path}')
+                if partition_writer is None:
+                    partition_writer = PartitionWriter(self.__dataset_dir,
+                                                       table.schema,
+                                                       self.__column_profile,
+                                                       self.__layout)
 
-            # Load the CSV file with the voting data.
-            voting_df = self.__load_csv_file(file_path)
+                partition_writer.write(table)
+        except BaseException:
+            if partition_writer is not None:
+                partition_writer.abort()
+            raise
 
-            # Merge positions of Brazilian parties with the DataFrame.
-            voting_df = self.__integrate_brazilian_party_roles(voting_df)
+        if partition_writer is not None:
+            partition_writer.commit()
 
-            # Save the processed election data.
-            self.__save_processed_data(dataframe=voting_df,
-                                       data_directory='data',
-                                       file_name=file_name,
-                                       file_type='parquet')
+    def process_file(self, source_directory: str) -> None:
+        """Process the files with voting data, one per year, in parallel.
+
+        Raises:
+            RuntimeError: If any file could not be processed.
+        """
+
+        csv_files = self.__get_csv_files(source_directory)
+        memory_estimates = {file_path: self.__estimate_memory(file_path) for file_path in csv_files}
+        workers = self.__count_workers(list(memory_estimates.values()))
+        failures = []
+
+        print(f'Processing {len(csv_files)} files with {workers} workers.')
+
+        # The largest files first, so the last one to finish is a small one.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.save_processed_data, file_path): file_path
+                       for file_path in sorted(csv_files, key=memory_estimates.get, reverse=True)}
+
+            for future in tqdm(as_completed(futures), total=len(futures), desc='Processing files'):
+                file_path = futures[future]
+
+                # A failing year is reported without stopping the other ones.
+                try:
+                    future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    print(f'Error saving the processed data: {file_path}')
+                    print(f'Error: {error}')
+                    failures.append(file_path)
+                else:
+                    print(f'Processed file: {file_path}')
+
+        # Summarize the footers of all partitions for the readers.
+        write_metadata(self.__dataset_dir)
+
+        if failures:
+            raise RuntimeError(f'Failed to process the files: {sorted(failures)}')
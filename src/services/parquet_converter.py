@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: parquet_converter.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+import csv
+import os
+from typing import Iterator, List
+
+import pyarrow as pa
+import pyarrow.csv as pv
+
+from src.interfaces.converter import ParquetConverterInterface
+from src.services.csv_source import CSVSource
+from src.utils.column_profiles import select_columns, validate_column_profile
+from src.utils.helpers import TSECVSDialect
+from src.utils.member_filter import MEMBER_SCOPE_PATTERN, NATIONAL_SCOPE, MemberFilter
+from src.utils.parquet_dataset import (DATASET_DIRECTORY,
+                                       ParquetLayout,
+                                       PartitionWriter,
+                                       partition_file_path,
+                                       read_column_profile)
+from src.utils.party_lineage import (PartyLineageResolver,
+                                     load_party_positions,
+                                     party_lineage_resolver,
+                                     take_party_positions)
+from src.utils.tse_schema import cast_to_tse_schema, tse_schema
+
+
+class ParquetConverter(ParquetConverterInterface):
+    """Convert the per-UF CSV files of one election year straight to Parquet.
+
+    Each file, read from the extraction directory or from the downloaded zip
+    archive, is parsed by the multithreaded `pyarrow.csv` reader and its record
+    batches are written, together with the positions of the parties, to the
+    `ParquetWriter` of their `ANO_ELEICAO=/SG_UF=` partition as they arrive.
+    Neither the merged CSV file nor a DataFrame with the whole year is ever
+    built, so the memory use is bounded by the block size, and only the
+    partitions of the selected UFs are rewritten.
+    """
+
+    def __init__(self,
+                 source_location: str,
+                 year: int,
+                 dataset_dir: str = DATASET_DIRECTORY,
+                 member_filter: MemberFilter = None,
+                 positions_file: str = 'data/positions_brazilian_parties.csv',
+                 column_profile: str = 'full',
+                 block_size: int = 16 * 1024 * 1024,
+                 layout: ParquetLayout = None) -> None:
+        self.__source = CSVSource(source_location, member_filter or MemberFilter())
+        self.__year = year
+        self.__dataset_dir = dataset_dir
+        self.__positions_file = positions_file
+        self.__column_profile = validate_column_profile(column_profile)
+        self.__block_size = block_size
+        self.__layout = layout
+
+    @property
+    def year(self) -> int:
+        return self.__year
+
+    def __read_column_names(self, csv_file: str) -> List[str]:
+        """Read the column names from the header of a CSV file."""
+
+        with self.__source.open_text(csv_file) as file_object:
+            return next(csv.reader(file_object, dialect=TSECVSDialect))
+
+    def __read_party_positions(self) -> pa.Table:
+        """Load positions of Brazilian parties."""
+
+        party_positions = pa.Table.from_pandas(load_party_positions(self.__positions_file), preserve_index=False)
+
+        return cast_to_tse_schema(party_positions)
+
+    def __integrate_brazilian_party_roles(self,
+                                          batch: pa.RecordBatch,
+                                          party_positions: pa.Table,
+                                          resolver: PartyLineageResolver) -> pa.RecordBatch:
+        """Append the positions of the parties, resolved through their lineages, to a batch."""
+
+        # Row of each party in the positions table, null when the party has no position.
+        positions = take_party_positions(batch.column('SG_PARTIDO'), party_positions, resolver)
+
+        return pa.RecordBatch.from_arrays(batch.columns + [column.combine_chunks() for column in positions.columns],
+                                          names=batch.schema.names + positions.column_names)
+
+    def __read_csv_batches(self, csv_file: str, schema: pa.Schema) -> Iterator[pa.RecordBatch]:
+        """Stream the record batches of a CSV file parsed with the given schema."""
+
+        read_options = pv.ReadOptions(encoding='latin-1', block_size=self.__block_size)
+        parse_options = pv.ParseOptions(delimiter=';')
+        # Only the columns of the profile are decoded.
+        convert_options = pv.ConvertOptions(column_types=schema,
+                                            include_columns=schema.names,
+                                            strings_can_be_null=True)
+
+        with self.__source.open_binary(csv_file) as file_object:
+            reader = pv.open_csv(file_object,
+                                 read_options=read_options,
+                                 parse_options=parse_options,
+                                 convert_options=convert_options)
+
+            if reader.schema != schema:
+                raise ValueError(f'The header of {csv_file} differs from the other CSV files.')
+
+            yield from reader
+
+    def __write_partitions(self, csv_files: List[str]) -> None:
+        """Write the batches of all the CSV files to the partitions of their states."""
+
+        schema = tse_schema(select_columns(self.__read_column_names(csv_files[0]), self.__column_profile))
+        party_positions = self.__read_party_positions()
+        resolver = party_lineage_resolver(self.__positions_file)
+        output_schema = pa.schema(list(schema) + [field for field in party_positions.schema
+                                                  if field.name != 'SG_PARTIDO'])
+
+        # The partitions are only replaced once the whole year is converted.
+        with PartitionWriter(self.__dataset_dir,
+                             output_schema,
+                             self.__column_profile,
+                             self.__layout) as partition_writer:
+            for csv_file in csv_files:
+                for batch in self.__read_csv_batches(csv_file, schema):
+                    partition_writer.write(self.__integrate_brazilian_party_roles(batch, party_positions, resolver))
+
+    def __is_up_to_date(self, csv_files: List[str]) -> bool:
+        """Check if the partitions of the per-UF files exist and are newer than them and the party positions."""
+
+        scopes = {MEMBER_SCOPE_PATTERN.search(os.path.basename(csv_file)) for csv_file in csv_files}
+        ufs = {scope.group('scope').upper() for scope in scopes if scope}
+
+        # The national file has no partition of its own to compare with.
+        if None in scopes or NATIONAL_SCOPE in ufs:
+            return False
+
+        last_modified = max(self.__source.last_modified(csv_files), os.path.getmtime(self.__positions_file))
+
+        for uf in ufs:
+            file_path = partition_file_path(self.__dataset_dir, self.__year, uf)
+            if not os.path.exists(file_path) or os.path.getmtime(file_path) < last_modified:
+                return False
+
+            if read_column_profile(file_path) != self.__column_profile:
+                return False
+
+        return True
+
+    def convert(self) -> None:
+        """Convert the CSV files of the election year to its partitions of the dataset."""
+
+        if not self.__source.exists():
+            raise FileNotFoundError(f'{self.__source.location} does not exist or is not a directory or archive.')
+
+        csv_files = self.__source.list_members()
+        if not csv_files:
+            raise FileNotFoundError(f'No CSV files found in {self.__source.location}.')
+
+        if self.__is_up_to_date(csv_files):
+            print(f'The partitions of {self.__year} are up to date.')
+            return
+
+        self.__write_partitions(csv_files)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: remote_zip.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
+
+import io
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List
+from zipfile import BadZipFile, ZipFile
+
+import requests
+from tqdm import tqdm
+
+from src.models.election_year import ElectionYear
+from src.utils.helpers import make_directory
+from src.utils.http_session import create_session
+from src.utils.member_filter import MemberFilter
+
+
+class HTTPRangeFile(io.RawIOBase):
+    """Read-only, seekable view of a remote file backed by HTTP range requests."""
+
+    def __init__(self, session: requests.Session, url: str, timeout: int = 30) -> None:
+        super().__init__()
+
+        self.__session = session
+        self.__url = url
+        self.__timeout = timeout
+        self.__position = 0
+
+        response = self.__session.head(url, timeout=self.__timeout, allow_redirects=True)
+        response.raise_for_status()
+
+        if response.headers.get('accept-ranges', '').lower() != 'bytes':
+            raise IOError(f'The server does not accept range requests for {url}.')
+
+        self.__size = int(response.headers['content-length'])
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.__position = offset
+        elif whence == io.SEEK_CUR:
+            self.__position += offset
+        elif whence == io.SEEK_END:
+            self.__position = self.__size + offset
+        else:
+            raise ValueError(f'Invalid whence value: {whence}')
+
+        return self.__position
+
+    def readinto(self, buffer) -> int:
+        if self.__position >= self.__size or len(buffer) == 0:
+            return 0
+
+        end = min(self.__position + len(buffer), self.__size) - 1
+        response = self.__session.get(self.__url,
+                                      headers={'Range': f'bytes={self.__position}-{end}'},
+                                      timeout=self.__timeout)
+        response.raise_for_status()
+
+        if response.status_code != 206:
+            raise IOError(f'The server ignored the range request for {self.__url}.')
+
+        data = response.content
+        buffer[:len(data)] = data
+        self.__position += len(data)
+
+        return len(data)
+
+
+class RemoteZipExtractor:
+    """Extract selected members of the remote TSE archives without downloading them.
+
+    The central directory of each archive is read with a range request and only
+    the bytes of the selected members are fetched and inflated straight into
+    `<output_directory>/<year>/`.
+    """
+
+    def __init__(self,
+                 election_year: ElectionYear,
+                 election_years: List[int],
+                 member_filter: MemberFilter,
+                 max_workers: int = 3,
+                 buffer_size: int = 1024 * 1024) -> None:
+        self.__election_year = election_year
+        self.__election_years = election_years
+        self.__member_filter = member_filter
+        self.__max_workers = max_workers
+        self.__buffer_size = buffer_size
+
+        # One connection pool shared by all the extraction threads.
+        self.__session = create_session(self.__max_workers)
+
+    def __extract_members(self, year: int, output_directory: str) -> List[str]:
+        """Fetch and inflate the selected members of one remote archive."""
+
+        url = self.__election_year(year).generate_url()
+        make_directory(output_directory)
+        extracted_files = []
+
+        with HTTPRangeFile(self.__session, url) as remote_file:
+            buffered_file = io.BufferedReader(remote_file, buffer_size=self.__buffer_size)
+
+            with ZipFile(buffered_file, 'r') as zip_ref:
+                for member in self.__member_filter.select(zip_ref.namelist()):
+                    output_path = os.path.join(output_directory, os.path.basename(member))
+                    temporary_path = f'{output_path}.tmp'
+                    print(f'Extracting {url}:{member} to {output_directory}...')
+
+                    # Never leave a half written member behind.
+                    with zip_ref.open(member) as source, open(temporary_path, 'wb') as target:
+                        shutil.copyfileobj(source, target, self.__buffer_size)
+
+                    os.replace(temporary_path, output_path)
+                    extracted_files.append(output_path)
+
+        return extracted_files
+
+    def extract_all_files(self, output_directory: str) -> None:
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            futures = {
+                executor.submit(self.__extract_members, year, f'{output_directory}/{year}'): year
+                for year in self.__election_years
+            }
+
+            for future in tqdm(as_completed(futures), total=len(futures), desc='Extracting remote files'):
+                year = futures[future]
+                try:
+                    extracted_files = future.result()
+                    print(f'Remote extraction of {year} completed: {len(extracted_files)} files.')
+                except BadZipFile as error:
+                    print(f'The remote file of {year} is corrupt or invalid.')
+                    print(error)
+                    raise
+                except Exception as error:
+                    print(f'An error occurred while extracting the remote file of {year}.')
+                    print(error)
+                    raise
+
+        print('All remote files extracted successfully.')
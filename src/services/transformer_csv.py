@@ -18,32 +18,62 @@
 # pylint: disable=missing-module-docstring, missing-function-docstring, missing-class-docstring
 
 import csv
-import glob
 import os
 from typing import Iterator, List
 
 from src.interfaces.transformer import CVSTransformerInterface
-from src.utils.helpers import TSECVSDialect
+from src.services.csv_source import CSVSource
+from src.utils.helpers import TSECVSDialect, copy_file_tail, delete_file, make_directory
+from src.utils.manifest import JsonManifest
+from src.utils.member_filter import MemberFilter
 
 
 class CVSTransformer(CVSTransformerInterface):
-    """Transform a CSV file with TSE data."""
-
-    def __init__(self, source_directory: str, output_dir: str, output_file: str) -> None:
+    """Transform a CSV file with TSE data.
+
+    The source can be the directory with the extracted CSV files or the
+    downloaded zip archive itself, whose members are read as decompressing
+    streams without an extraction step.
+
+    All TSE files of a year share the same dialect, encoding and header, so by
+    default the merge is a byte-level concatenation: the header of each file is
+    checked once and its body is copied as is, inside the kernel when the
+    source is a plain file. The row-by-row path through `csv.reader` and
+    `csv.writer` is kept for the `validate_rows` mode.
+
+    The merged file is written to a temporary file and renamed over the output
+    only when complete. The members it was built from are recorded in a
+    manifest next to it, and a merge whose selected members are the same is
+    skipped, so reruns neither duplicate rows nor redo finished years, while a
+    different selection of UFs or scenario rebuilds the output.
+    """
+
+    def __init__(self,
+                 source_directory: str,
+                 output_dir: str,
+                 output_file: str,
+                 member_filter: MemberFilter = None,
+                 validate_rows: bool = False,
+                 buffer_size: int = 4 * 1024 * 1024) -> None:
         self.__source_directory = source_directory
+        self.__validate_rows = validate_rows
+        self.__buffer_size = buffer_size
+        self.__source = CSVSource(source_directory, member_filter or MemberFilter())
         self.__output_dir = output_dir
         self.__output_file = output_file
         self.__output_file_path = f'{self.__output_dir}/{self.__output_file.format(output_dir.split('/')[-1])}'
+        self.__manifest_file_path = f'{self.__output_file_path}.manifest.json'
+
+    @property
+    def output_file_path(self) -> str:
+        """Path of the merged CSV file."""
 
-    def __get_csv_files(self,
-                        extension: str = '*[0-9][0-9][0-9][0-9]_[A-Z][A-Z].csv',
-                        scenario_filter: str = 'uf') -> list:
-        """Get all CSV files in the source directory."""
+        return self.__output_file_path
 
-        if scenario_filter == 'uf':
-            return glob.glob(f'{self.__source_directory}/{extension}')
+    def __get_csv_files(self) -> list:
+        """Get the CSV files of the selected scenario in the source directory or archive."""
 
-        return glob.glob(f'{self.__source_directory}/*.cvs')
+        return self.__source.list_members()
 
     def __read_csv_rows(self,
                         file_path: str,
@@ -51,7 +81,7 @@ class CVSTransformer(CVSTransformerInterface):
         """Read a CSV file and return its content."""
 
         try:
-            with open(file_path, mode='r', encoding=file_encoding) as file_object:
+            with self.__source.open_text(file_path, encoding=file_encoding) as file_object:
                 csv_reader = csv.reader(file_object, dialect=TSECVSDialect)
 
                 yield from csv_reader
@@ -64,45 +94,127 @@ class CVSTransformer(CVSTransformerInterface):
     def __skip_csv_header(self, data: Iterator[List[str]]) -> Iterator[List[str]]:
         """Skip the header of a CSV file."""
 
-        return (row for index, row in enumerate(data) if index > 0)
+        next(data, None)
 
-    def __write_csv_rows(self, data: Iterator[List[str]],  file_encoding: str = 'latin-1') -> None:
-        """Write data to a CSV file."""
+        return data
 
-        # Checking if the target file already exists and has no content.
-        output_file_exists = os.path.exists(self.__output_file_path)
-        output_file_not_empty = output_file_exists and os.path.getsize(self.__output_file_path) > 0
+    def __check_csv_rows(self, data: Iterator[List[str]], file_path: str) -> Iterator[List[str]]:
+        """Report the rows whose number of fields differs from the header."""
 
-        try:
-            with open(self.__output_file_path,
-                      mode='a',
-                      encoding=file_encoding,
-                      newline='') as file_object:
-                csv_writer = csv.writer(file_object, dialect=TSECVSDialect)
+        header = next(data, None)
+        if header is None:
+            return
+
+        yield header
+
+        invalid_rows = 0
+        for row in data:
+            if len(row) != len(header):
+                invalid_rows += 1
+            yield row
+
+        if invalid_rows:
+            print(f'{file_path}: {invalid_rows} rows with a number of fields different from the header.')
+
+    def __read_header(self, file_object) -> bytes:
+        """Read the header line of a binary stream, leaving it at the first data row."""
+
+        return file_object.readline()
+
+    def __concatenate_csv_files(self, csv_files: List[str], output_file_path: str) -> None:
+        """Merge the CSV files by copying their bytes, keeping a single header."""
+
+        expected_header = None
+
+        # Unbuffered, so the header and the kernel-side copies can not interleave.
+        with open(output_file_path, mode='wb', buffering=0) as output_file:
+            for csv_file in csv_files:
+                with self.__source.open_binary(csv_file) as input_file:
+                    header = self.__read_header(input_file)
+
+                    if expected_header is None:
+                        expected_header = header
+                        output_file.write(header)
+                    elif header.rstrip(b'\r\n') != expected_header.rstrip(b'\r\n'):
+                        raise ValueError(f'The header of {csv_file} differs from the other CSV files.')
+
+                    last_byte = header[-1:]
+
+                    if self.__source.is_archive:
+                        while chunk := input_file.read(self.__buffer_size):
+                            output_file.write(chunk)
+                            last_byte = chunk[-1:]
+                    elif copy_file_tail(csv_file, output_file.fileno(), len(header), self.__buffer_size):
+                        input_file.seek(-1, os.SEEK_END)
+                        last_byte = input_file.read(1)
 
-                if output_file_not_empty:
+                # A file without a final line break would glue two rows together.
+                if last_byte and last_byte != b'\n':
+                    output_file.write(b'\n')
+
+    def __write_csv_rows(self,
+                         csv_files: List[str],
+                         output_file_path: str,
+                         file_encoding: str = 'latin-1') -> None:
+        """Write the rows of the CSV files to a single CSV file, keeping the first header."""
+
+        with open(output_file_path,
+                  mode='w',
+                  encoding=file_encoding,
+                  newline='') as file_object:
+            csv_writer = csv.writer(file_object, dialect=TSECVSDialect)
+
+            for index, csv_file in enumerate(csv_files):
+                data = self.__check_csv_rows(self.__read_csv_rows(csv_file, file_encoding), csv_file)
+
+                if index > 0:
                     data = self.__skip_csv_header(data)
 
                 csv_writer.writerows(data)
 
-        except csv.Error as csv_error:
-            print(f'CSV Error: {csv_error}')
-        except IOError as io_error:
-            print(f'Input/Output Error: {io_error}')
+    def __is_up_to_date(self, inputs: dict) -> bool:
+        """Check if the merged file exists and was built from the same CSV files."""
+
+        if not os.path.exists(self.__output_file_path):
+            return False
+
+        return JsonManifest(self.__manifest_file_path).get('inputs') == inputs
 
     def __merge_csv_files(self) -> None:
         """Merge all CSV files in the source directory into a single file."""
 
-        if not os.path.exists(self.__source_directory) and not os.path.isdir(self.__source_directory):
-            raise FileNotFoundError(f'{self.__source_directory} does not exist or is not a directory.')
+        if not self.__source.exists():
+            raise FileNotFoundError(f'{self.__source_directory} does not exist or is not a directory or archive.')
+
+        make_directory(self.__output_dir)
 
         csv_files = self.__get_csv_files()
         if not csv_files:
             raise FileNotFoundError(f'No CSV files found in {self.__source_directory}.')
 
-        for csv_file in csv_files:
-            csv_data = self.__read_csv_rows(csv_file, 'latin-1')
-            self.__write_csv_rows(csv_data)
+        inputs = self.__source.fingerprint(csv_files)
+        if self.__is_up_to_date(inputs):
+            print(f'{self.__output_file_path} is up to date.')
+            return
+
+        # The output is only replaced once the merge is complete.
+        temporary_file_path = f'{self.__output_file_path}.tmp'
+
+        try:
+            if self.__validate_rows:
+                self.__write_csv_rows(csv_files, temporary_file_path)
+            else:
+                self.__concatenate_csv_files(csv_files, temporary_file_path)
+
+            os.replace(temporary_file_path, self.__output_file_path)
+        except BaseException:
+            delete_file(temporary_file_path)
+            raise
+
+        # Recorded only after the output is in place, so an interrupted merge is redone.
+        manifest = JsonManifest(self.__manifest_file_path)
+        manifest.update('inputs', inputs)
+        manifest.save()
 
     def transform(self) -> None:
         """Transform the data in the CSV files."""
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: bandwidth.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+import time
+from threading import Lock
+
+
+class BandwidthLimiter:
+    """Token bucket that caps the total transfer rate of all download workers."""
+
+    def __init__(self, max_bytes_per_second: float, burst_seconds: float = 1.0) -> None:
+        if max_bytes_per_second <= 0:
+            raise ValueError('max_bytes_per_second must be greater than zero')
+
+        self.__rate = max_bytes_per_second
+        self.__capacity = max_bytes_per_second * burst_seconds
+        self.__tokens = self.__capacity
+        self.__last_refill = time.monotonic()
+        self.__lock = Lock()
+
+    def consume(self, size: int) -> None:
+        """Block the calling thread until `size` bytes can be transferred."""
+
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__capacity, self.__tokens + (now - self.__last_refill) * self.__rate)
+            self.__last_refill = now
+
+            # Borrow from the bucket and wait for the debt to be refilled.
+            self.__tokens -= size
+            wait_time = -self.__tokens / self.__rate if self.__tokens < 0 else 0
+
+        if wait_time > 0:
+            time.sleep(wait_time)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: column_profiles.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+from typing import List
+
+# Columns of the TSE files kept by each profile; None keeps all of them. The
+# party positions are joined after parsing and are always kept.
+COLUMN_PROFILES = {
+    'full': None,
+    'dashboard': ['ANO_ELEICAO',
+                  'SG_UF',
+                  'SG_UE',
+                  'NM_UE',
+                  'CD_MUNICIPIO',
+                  'NM_MUNICIPIO',
+                  'DS_CARGO',
+                  'NR_TURNO',
+                  'SQ_CANDIDATO',
+                  'NR_CANDIDATO',
+                  'NM_CANDIDATO',
+                  'NM_URNA_CANDIDATO',
+                  'NR_PARTIDO',
+                  'SG_PARTIDO',
+                  'NM_PARTIDO',
+                  'QT_VOTOS_NOMINAIS',
+                  'DS_SIT_TOT_TURNO'],
+}
+
+
+def validate_column_profile(profile: str) -> str:
+    """Check that the column profile exists.
+
+    Raises:
+        ValueError: If the profile is not valid.
+    """
+
+    if profile not in COLUMN_PROFILES:
+        raise ValueError(f'Column profile "{profile}" is not valid. Available profiles: {list(COLUMN_PROFILES)}')
+
+    return profile
+
+
+def select_columns(column_names: List[str], profile: str = 'full') -> List[str]:
+    """Columns of a file kept by a profile, in the order of the file.
+
+    Arguments:
+        column_names {List[str]} -- Header of the file.
+        profile {str} -- Name of the column profile. Defaults to 'full'.
+
+    Raises:
+        ValueError: If the profile is not valid or a column of the profile is missing.
+    """
+
+    profile_columns = COLUMN_PROFILES[validate_column_profile(profile)]
+    if profile_columns is None:
+        return list(column_names)
+
+    missing_columns = set(profile_columns) - set(column_names)
+    if missing_columns:
+        raise ValueError(f'Columns of the profile "{profile}" missing from the file: {sorted(missing_columns)}')
+
+    return [column_name for column_name in column_names if column_name in profile_columns]
@@ -17,6 +17,7 @@
 # ------------------------------------------------------------------------------
 
 import argparse
+import os
 
 
 def get_arguments() -> argparse.Namespace:
@@ -47,18 +48,36 @@ def get_arguments() -> argparse.Namespace:
                         help='Run the download step.'
                         )
 
+    parser.add_argument('--mirror',
+                        action='store_true',
+                        help='Sync the TSE archives into the local mirror directory.'
+                        )
+
     parser.add_argument('-e',
                         '--extract',
                         action='store_true',
                         help='Run the extraction step.'
                         )
 
+    parser.add_argument('-r',
+                        '--remote-extract',
+                        action='store_true',
+                        help='Extract only the selected members straight from the remote archives.'
+                        )
+
     parser.add_argument('-m',
                         '--merge',
                         action='store_true',
                         help='Run the merge step.'
                         )
 
+    parser.add_argument('-c',
+                        '--convert',
+                        action='store_true',
+                        help='Convert the per-state CSV files of each year straight to Parquet, '
+                             'replacing the merge, aggregation and processing steps.'
+                        )
+
     parser.add_argument('-g',
                         '--aggregate',
                         action='store_true',
@@ -71,11 +90,137 @@ def get_arguments() -> argparse.Namespace:
                         help='Run the processing step.'
                         )
 
+    parser.add_argument('--elected',
+                        action='store_true',
+                        help='Build the elected candidates of each year read by the dashboard.'
+                        )
+
+    parser.add_argument('--summarize',
+                        action='store_true',
+                        help='Materialize the aggregate tables of each year read by the dashboard.'
+                        )
+
     parser.add_argument('-a',
                         '--all',
                         action='store_true',
                         help='Run all steps.'
                         )
 
+    parser.add_argument('--years',
+                        type=int,
+                        nargs='+',
+                        default=None,
+                        help='Restrict the remote extraction to these election years.'
+                        )
+
+    parser.add_argument('--ufs',
+                        nargs='+',
+                        default=None,
+                        help='Restrict the extracted and merged per-state files to these UFs (e.g. SP MG).'
+                        )
+
+    parser.add_argument('--scenario',
+                        choices=['uf', 'national', 'all'],
+                        default='uf',
+                        help='Select the per-state files, the national file or both. Defaults to uf.'
+                        )
+
+    parser.add_argument('--extensions',
+                        nargs='+',
+                        default=['.csv'],
+                        help='Extensions of the data files to extract. Defaults to .csv.'
+                        )
+
+    parser.add_argument('--include',
+                        nargs='+',
+                        default=None,
+                        help='Glob patterns of other archive members to extract (e.g. "*.pdf").'
+                        )
+
+    parser.add_argument('--exclude',
+                        nargs='+',
+                        default=None,
+                        help='Glob patterns of archive members to skip.'
+                        )
+
+    parser.add_argument('--from-archives',
+                        action='store_true',
+                        help='Read the CSV files straight from the downloaded archives, without extraction.'
+                        )
+
+    parser.add_argument('--validate-rows',
+                        action='store_true',
+                        help='Merge row by row with the csv module, reporting malformed rows, '
+                             'instead of concatenating the files byte by byte.'
+                        )
+
+    parser.add_argument('--merge-workers',
+                        type=int,
+                        default=None,
+                        help='Number of election years merged in parallel. Defaults to the number of CPUs.'
+                        )
+
+    parser.add_argument('--column-profile',
+                        choices=['full', 'dashboard'],
+                        default='full',
+                        help='Columns kept by the process and convert steps: all of them or only the ones '
+                             'used by the dashboard. Defaults to full.'
+                        )
+
+    parser.add_argument('--chunk-size',
+                        type=int,
+                        default=None,
+                        help='Process the files in chunks of this many rows, bounding the memory use. '
+                             'Defaults to whole files.'
+                        )
+
+    parser.add_argument('--process-workers',
+                        type=int,
+                        default=None,
+                        help='Maximum number of years processed in parallel, further bounded by the '
+                             'available memory. Defaults to the number of CPUs.'
+                        )
+
+    parser.add_argument('--row-group-size',
+                        type=int,
+                        default=None,
+                        help='Rows per row group of the Parquet partitions. Defaults to 131072.'
+                        )
+
+    parser.add_argument('--compression',
+                        choices=['zstd', 'snappy', 'gzip', 'brotli', 'lz4', 'none'],
+                        default=None,
+                        help='Compression of the Parquet partitions. Defaults to zstd.'
+                        )
+
+    parser.add_argument('--cache-dir',
+                        default=None,
+                        help='Content-addressed cache for the downloaded archives, shared between checkouts.'
+                        )
+
+    parser.add_argument('--base-url',
+                        default=os.environ.get('TSE_BASE_URL'),
+                        help='Base URL of the archives (http://, https:// or file:// mirror). '
+                             'Defaults to $TSE_BASE_URL or the TSE CDN.'
+                        )
+
+    parser.add_argument('--mirror-dir',
+                        default='mirror',
+                        help='Directory synced by --mirror. Defaults to mirror.'
+                        )
+
+    parser.add_argument('--download-engine',
+                        choices=['threads', 'asyncio'],
+                        default='threads',
+                        help='Engine used by the download step: a thread pool, or an asyncio scheduler '
+                             'with adaptive concurrency over the same blocking downloads. Defaults to threads.'
+                        )
+
+    parser.add_argument('--max-bandwidth',
+                        type=float,
+                        default=None,
+                        help='Cap the total download bandwidth, in MiB/s.'
+                        )
+
     # Parse the arguments.
     return parser.parse_args()
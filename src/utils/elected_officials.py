@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: elected_officials.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+import pandas as pd
+
+# Elected candidates of each year, one file per position and year.
+ELECTED_DIRECTORY = 'data/elected'
+
+# Columns read from the voting data to build the elected candidates.
+ELECTED_COLUMNS = ['DS_CARGO',
+                   'NR_TURNO',
+                   'DS_SIT_TOT_TURNO',
+                   'SQ_CANDIDATO',
+                   'SG_UF',
+                   'SG_UE',
+                   'NM_UE',
+                   'CD_MUNICIPIO',
+                   'NM_MUNICIPIO',
+                   'SG_PARTIDO',
+                   'NR_PARTIDO',
+                   'NM_PARTIDO',
+                   'NR_CANDIDATO',
+                   'NM_CANDIDATO',
+                   'NM_URNA_CANDIDATO',
+                   'Espectro',
+                   'Espectro_Detalhado',
+                   'Posicionamento',
+                   'QT_VOTOS_NOMINAIS']
+
+# One row per candidate: the votes of all zones are summed.
+ELECTED_AGGREGATIONS = {'SG_UF': 'first',
+                        'SG_UE': 'first',
+                        'NM_UE': 'first',
+                        'CD_MUNICIPIO': 'first',
+                        'NM_MUNICIPIO': 'first',
+                        'SG_PARTIDO': 'first',
+                        'NR_PARTIDO': 'first',
+                        'NM_PARTIDO': 'first',
+                        'NR_CANDIDATO': 'first',
+                        'NM_CANDIDATO': 'first',
+                        'NM_URNA_CANDIDATO': 'first',
+                        'Espectro': 'first',
+                        'Espectro_Detalhado': 'first',
+                        'Posicionamento': 'first',
+                        'QT_VOTOS_NOMINAIS': 'sum'}
+
+
+def elected_file_path(elected_dir: str, position: str, year: int) -> str:
+    """Path of the file with the elected candidates of a position in a year.
+
+    Arguments:
+        elected_dir {str} -- Directory of the elected candidates files.
+        position {str} -- Position (DS_CARGO), e.g. 'Prefeito'.
+        year {int} -- Election year.
+    """
+
+    return f'{elected_dir}/{position.lower()}_{year}.parquet'
+
+
+def aggregate_elected_candidates(data: pd.DataFrame, position: str = 'Prefeito') -> pd.DataFrame:
+    """Filter the elected candidates of a position and sum their votes across the zones.
+
+    Arguments:
+        data {pd.DataFrame} -- Voting data per zone.
+        position {str} -- Position (DS_CARGO). Defaults to 'Prefeito'.
+
+    Returns:
+        pd.DataFrame -- One row per elected candidate.
+    """
+
+    elected_df = data[(data['DS_CARGO'] == position) & (data['DS_SIT_TOT_TURNO'] == 'ELEITO')]
+    elected_df = elected_df.groupby('SQ_CANDIDATO').agg(ELECTED_AGGREGATIONS).reset_index()
+
+    # Dictionary-encoded columns keep only the values of the elected candidates,
+    # so the counts per category have no empty entries.
+    for column in elected_df.select_dtypes('category'):
+        elected_df[column] = elected_df[column].cat.remove_unused_categories()
+
+    return elected_df
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: election_aggregates.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+import pandas as pd
+
+# Aggregate tables of each year, one directory per version of their layout.
+AGGREGATES_DIRECTORY = 'data/aggregates'
+
+# Bumped whenever the columns or the meaning of a table change, so the
+# dashboard never reads tables of another layout.
+AGGREGATES_VERSION = 2
+
+# One row per candidate and round: the votes of all zones are summed.
+CANDIDATE_VOTES_AGGREGATIONS = {'DS_CARGO': 'first',
+                                'SG_UF': 'first',
+                                'CD_MUNICIPIO': 'first',
+                                'NM_UE': 'first',
+                                'SG_PARTIDO': 'first',
+                                'NR_CANDIDATO': 'first',
+                                'NM_URNA_CANDIDATO': 'first',
+                                'Espectro': 'first',
+                                'QT_VOTOS_NOMINAIS': 'sum'}
+
+# Order of the political spectrum, from left to right.
+SPECTRUM_TYPE = pd.CategoricalDtype(categories=['Esquerda', 'Centro', 'Direita'], ordered=True)
+
+
+def aggregates_version_directory(aggregates_dir: str, version: int = AGGREGATES_VERSION) -> str:
+    """Directory of the aggregate tables of a version.
+
+    Arguments:
+        aggregates_dir {str} -- Directory of the aggregate tables.
+        version {int} -- Version of the tables. Defaults to AGGREGATES_VERSION.
+    """
+
+    return f'{aggregates_dir}/v{version}'
+
+
+def aggregate_file_path(aggregates_dir: str, table: str, year: int) -> str:
+    """Path of an aggregate table of a year, in the current version.
+
+    Arguments:
+        aggregates_dir {str} -- Directory of the aggregate tables.
+        table {str} -- Name of the table, e.g. 'party_counts'.
+        year {int} -- Election year.
+    """
+
+    return f'{aggregates_version_directory(aggregates_dir)}/{table}_{year}.parquet'
+
+
+def count_by_party(elected_df: pd.DataFrame) -> pd.DataFrame:
+    """Number of elected candidates by party, the largest first."""
+
+    party_counts = elected_df['SG_PARTIDO'].value_counts().reset_index()
+    party_counts.columns = ['Partido', 'Quantidade']
+
+    return party_counts.sort_values(by='Quantidade', ascending=False, ignore_index=True)
+
+
+def count_by_party_and_state(elected_df: pd.DataFrame) -> pd.DataFrame:
+    """Number of elected candidates by party and UF, the largest first within each party."""
+
+    state_counts = elected_df.groupby(['SG_PARTIDO', 'SG_UF'], observed=True).size().reset_index()
+    state_counts.columns = ['Partido', 'Estado', 'Quantidade']
+
+    return state_counts.sort_values(by=['Partido', 'Quantidade'], ascending=[True, False], ignore_index=True)
+
+
+def spectrum_by_municipality(elected_df: pd.DataFrame) -> pd.DataFrame:
+    """Political spectrum of the candidate elected in each municipality."""
+
+    spectrum_df = elected_df[['SG_UF', 'CD_MUNICIPIO', 'NM_UE', 'SG_PARTIDO', 'Espectro']].copy()
+    spectrum_df['Espectro'] = spectrum_df['Espectro'].astype(SPECTRUM_TYPE)
+
+    return spectrum_df.sort_values(by=['SG_UF', 'CD_MUNICIPIO'], ignore_index=True)
+
+
+def votes_by_candidate(voting_df: pd.DataFrame) -> pd.DataFrame:
+    """Votes of each candidate of every position in each round, summed across the zones."""
+
+    candidate_votes = voting_df.groupby(['SQ_CANDIDATO', 'NR_TURNO'], observed=True).agg(CANDIDATE_VOTES_AGGREGATIONS)
+
+    return candidate_votes.reset_index()
@@ -18,7 +18,17 @@
 # pylint: disable=missing-module-docstring, missing-function-docstring
 
 import os
+import shutil
 from csv import Dialect
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request of Linux to clone the extents of a file (reflink).
+FICLONE = 0x40049409
 
 
 class TSECVSDialect(Dialect):
@@ -46,6 +56,140 @@ def delete_file(file_path: str) -> None:
         os.remove(file_path)
 
 
+def available_memory() -> Optional[int]:
+    """Memory available for new processes, in bytes, or None when the platform does not tell."""
+
+    try:
+        with open('/proc/meminfo', mode='r', encoding='utf-8') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def reflink_file(source: str, target: str) -> None:
+    """Create target as a copy-on-write clone of source.
+
+    Raises:
+        OSError: If the platform or the filesystem does not support reflinks.
+    """
+
+    if fcntl is None:
+        raise OSError('Reflinks are not supported on this platform.')
+
+    with open(source, mode='rb') as source_file, open(target, mode='wb') as target_file:
+        try:
+            fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+        except OSError:
+            target_file.close()
+            os.remove(target)
+            raise
+
+
+def symlink_file(source: str, target: str) -> None:
+    """Create target as a symbolic link to the absolute path of source."""
+
+    os.symlink(os.path.abspath(source), target)
+
+
+# Ways of linking a file, tried in the given order before copying it.
+LINK_STRATEGIES = {'hardlink': os.link,
+                   'reflink': reflink_file,
+                   'symlink': symlink_file}
+
+
+def link_or_copy(source: str, target: str, strategies: List[str] = None) -> str:
+    """Atomically replace target with a link to source, without copying the data when possible.
+
+    The strategies are tried in order, and a copy is only the last resort. By
+    default a hard link is used, then a reflink, both only possible on the
+    same filesystem, and a symbolic link across filesystems.
+
+    Arguments:
+        source {str} -- Path of the existing file.
+        target {str} -- Path replaced by the link.
+        strategies {List[str]} -- Names of LINK_STRATEGIES to try, in order.
+                                  Defaults to ['hardlink', 'reflink', 'symlink'].
+
+    Returns:
+        str -- The strategy used: one of the strategies or 'copy'.
+    """
+
+    temporary_path = f'{target}.link'
+    delete_file(temporary_path)
+
+    for strategy in strategies or ['hardlink', 'reflink', 'symlink']:
+        try:
+            LINK_STRATEGIES[strategy](source, temporary_path)
+            break
+        except OSError:
+            delete_file(temporary_path)
+    else:
+        shutil.copy2(source, temporary_path)
+        strategy = 'copy'
+
+    os.replace(temporary_path, target)
+
+    return strategy
+
+
+def copy_file_tail(source_path: str, target_fd: int, offset: int, buffer_size: int = 1024 * 1024) -> int:
+    """Append the bytes of a file, from `offset` to its end, to an open file descriptor.
+
+    The copy is done inside the kernel with `os.copy_file_range` or
+    `os.sendfile` when the platform supports them, falling back to a buffered
+    copy in user space.
+
+    Returns:
+        int -- Number of bytes copied.
+    """
+
+    remaining = os.path.getsize(source_path) - offset
+    copied = 0
+
+    with open(source_path, mode='rb') as source_file:
+        source_fd = source_file.fileno()
+
+        for kernel_copy in (getattr(os, 'copy_file_range', None), getattr(os, 'sendfile', None)):
+            if kernel_copy is None:
+                continue
+
+            try:
+                while remaining > 0:
+                    if kernel_copy is os.sendfile:
+                        sent = os.sendfile(target_fd, source_fd, offset + copied, remaining)
+                    else:
+                        sent = os.copy_file_range(source_fd, target_fd, remaining, offset + copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+                    remaining -= sent
+
+                return copied
+            except OSError:
+                # Not supported between these files (e.g. across file systems), try the next one.
+                continue
+
+        source_file.seek(offset + copied)
+        while remaining > 0:
+            chunk = memoryview(source_file.read(min(buffer_size, remaining)))
+            if not chunk:
+                break
+            while chunk:
+                written = os.write(target_fd, chunk)
+                chunk = chunk[written:]
+                copied += written
+                remaining -= written
+
+    return copied
+
+
 def generate_election_years(start_year: int, end_year: int, interval: int = 4) -> list:
     """Generate a list of election years."""
 
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: http_session.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+import io
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+class BoundedFileReader(io.RawIOBase):
+    """Read at most `length` bytes of an open file, starting at its current position."""
+
+    def __init__(self, file_object, length: int) -> None:
+        super().__init__()
+        self.__file_object = file_object
+        self.__remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.__file_object.read(min(len(buffer), self.__remaining))
+        buffer[:len(data)] = data
+        self.__remaining -= len(data)
+
+        return len(data)
+
+    def close(self) -> None:
+        self.__file_object.close()
+        super().close()
+
+
+class LocalFileAdapter(BaseAdapter):
+    """Serve `file://` URLs with the HTTP semantics used by the downloaders.
+
+    GET and HEAD requests are answered with Content-Length, Last-Modified, ETag
+    and Accept-Ranges headers, and conditional (`If-None-Match`,
+    `If-Modified-Since`) and range (`Range`, `If-Range`) requests are honoured,
+    so a local mirror behaves like the TSE CDN.
+    """
+
+    def __build_response(self, request: requests.PreparedRequest, status_code: int, headers: dict):
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = {200: 'OK', 206: 'Partial Content', 304: 'Not Modified', 404: 'Not Found',
+                           405: 'Method Not Allowed', 416: 'Range Not Satisfiable'}.get(status_code)
+        response.headers = CaseInsensitiveDict(headers)
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(b'')
+
+        return response
+
+    def __parse_range(self, range_header: str, size: int) -> tuple:
+        """Parse a single `bytes=start-end` range, returning (start, end) or None."""
+
+        unit, _, byte_range = range_header.partition('=')
+        start, _, end = byte_range.strip().partition('-')
+
+        if unit.strip().lower() != 'bytes' or ',' in byte_range:
+            return None
+
+        if not start:
+            return max(size - int(end), 0), size - 1
+
+        return int(start), min(int(end), size - 1) if end else size - 1
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):  # pylint: disable=too-many-arguments
+        file_path = url2pathname(unquote(urlparse(request.url).path))
+
+        if request.method not in ('GET', 'HEAD'):
+            return self.__build_response(request, 405, {})
+
+        if not os.path.isfile(file_path):
+            return self.__build_response(request, 404, {})
+
+        file_stat = os.stat(file_path)
+        size = file_stat.st_size
+        etag = f'"{file_stat.st_mtime_ns:x}-{size:x}"'
+        last_modified = formatdate(file_stat.st_mtime, usegmt=True)
+        headers = {'Accept-Ranges': 'bytes', 'ETag': etag, 'Last-Modified': last_modified}
+
+        if_none_match = request.headers.get('If-None-Match')
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_none_match == etag or (if_none_match is None and if_modified_since
+                                     and parsedate_to_datetime(if_modified_since).timestamp() >= int(file_stat.st_mtime)):
+            return self.__build_response(request, 304, headers)
+
+        status_code, start, end = 200, 0, size - 1
+
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        if range_header and (if_range is None or if_range in (etag, last_modified)):
+            byte_range = self.__parse_range(range_header, size)
+
+            if byte_range is not None:
+                start, end = byte_range
+
+                if start >= size or start > end:
+                    headers['Content-Range'] = f'bytes */{size}'
+                    return self.__build_response(request, 416, headers)
+
+                status_code = 206
+                headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        headers['Content-Length'] = str(end - start + 1)
+        response = self.__build_response(request, status_code, headers)
+
+        if request.method == 'GET':
+            file_object = open(file_path, mode='rb')  # pylint: disable=consider-using-with
+            file_object.seek(start)
+            response.raw = BoundedFileReader(file_object, end - start + 1)
+
+        return response
+
+    def close(self):
+        pass
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Check if a failed request may succeed when retried.
+
+    Connection errors, timeouts and 429 or 5xx responses are transient;
+    other HTTP errors, such as a 404 for a year not published yet, are not.
+    """
+
+    if isinstance(error, requests.exceptions.HTTPError):
+        status_code = error.response.status_code if error.response is not None else None
+        return status_code == 429 or (status_code is not None and status_code >= 500)
+
+    return isinstance(error, (requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+def create_session(pool_size: int = 5) -> requests.Session:
+    """Create a HTTP session with a connection pool shared by all workers.
+
+    The session also understands `file://` URLs, see LocalFileAdapter.
+
+    Arguments:
+        pool_size {int} -- Number of connections kept alive per host. Defaults to 5.
+
+    Returns:
+        requests.Session -- The pooled session.
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    # Local mirrors are read straight from the disk.
+    session.mount('file://', LocalFileAdapter())
+
+    return session
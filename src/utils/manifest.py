@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: manifest.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+import json
+import os
+from threading import Lock
+
+
+class JsonManifest:
+    """Keep a small JSON document with one entry per tracked file.
+
+    The manifest is shared by the worker threads of a stage, so every access is
+    guarded by a lock and the document is replaced atomically on save.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.__file_path = file_path
+        self.__lock = Lock()
+        self.__entries = self.__load()
+
+    def __load(self) -> dict:
+        """Load the manifest entries from disk."""
+
+        if not os.path.exists(self.__file_path):
+            return {}
+
+        try:
+            with open(self.__file_path, mode='r', encoding='utf-8') as file_object:
+                return json.load(file_object)
+        except (IOError, ValueError) as error:
+            print(f'Ignoring unreadable manifest {self.__file_path}: {error}')
+            return {}
+
+    @property
+    def file_path(self) -> str:
+        return self.__file_path
+
+    def get(self, key: str) -> dict:
+        """Return a copy of the entry for a key, or an empty dict."""
+
+        with self.__lock:
+            return dict(self.__entries.get(key, {}))
+
+    def update(self, key: str, entry: dict) -> None:
+        """Replace the entry for a key."""
+
+        with self.__lock:
+            self.__entries[key] = dict(entry)
+
+    def remove(self, key: str) -> None:
+        """Remove the entry for a key, if present."""
+
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically."""
+
+        with self.__lock:
+            temporary_path = f'{self.__file_path}.tmp'
+
+            with open(temporary_path, mode='w', encoding='utf-8') as file_object:
+                json.dump(self.__entries, file_object, indent=2, sort_keys=True)
+
+            os.replace(temporary_path, self.__file_path)
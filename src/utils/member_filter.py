@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: member_filter.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+import os
+import re
+from fnmatch import fnmatch
+from typing import Iterable, List
+
+# TSE archives name their members `<dataset>_<year>_<UF>.csv`, plus a national
+# `<dataset>_<year>_BRASIL.csv` file with the rows of all states.
+MEMBER_SCOPE_PATTERN = re.compile(r'_(?P<scope>[A-Z]{2}|BRASIL)\.[^.]+$', re.IGNORECASE)
+
+NATIONAL_SCOPE = 'BRASIL'
+
+
+class MemberFilter:
+    """Select the members of a TSE archive.
+
+    A member is selected when it is not excluded and either matches one of the
+    include patterns or is a per-state/national data file accepted by the
+    scenario, the UF list and the extensions. Members left out are never
+    written, so the readme PDFs and the redundant `_BRASIL.csv` file cost
+    nothing by default.
+
+    Arguments:
+        scenario {str} -- 'uf' for the per-state files, 'national' for the
+                          `_BRASIL.csv` file or 'all' for both. Defaults to 'uf'.
+        ufs {Iterable[str]} -- Restrict the per-state files to these UFs. Defaults to None (all).
+        extensions {Iterable[str]} -- Extensions of the data files. Defaults to ('.csv',).
+        include {Iterable[str]} -- Glob patterns of other members to keep (e.g. '*.pdf'). Defaults to None.
+        exclude {Iterable[str]} -- Glob patterns of members to drop. Defaults to None.
+    """
+
+    SCENARIOS = ('uf', 'national', 'all')
+
+    def __init__(self,
+                 scenario: str = 'uf',
+                 ufs: Iterable[str] = None,
+                 extensions: Iterable[str] = ('.csv',),
+                 include: Iterable[str] = None,
+                 exclude: Iterable[str] = None) -> None:
+        if scenario not in self.SCENARIOS:
+            raise ValueError(f'Scenario "{scenario}" is not valid. Available scenarios: {list(self.SCENARIOS)}')
+
+        self.__scenario = scenario
+        self.__ufs = {uf.upper() for uf in ufs} if ufs else None
+        self.__extensions = {f'.{extension.lower().lstrip(".")}' for extension in extensions}
+        self.__include = list(include or [])
+        self.__exclude = list(exclude or [])
+
+    @property
+    def scenario(self) -> str:
+        return self.__scenario
+
+    @property
+    def ufs(self) -> set:
+        return self.__ufs
+
+    def matches(self, member_name: str) -> bool:
+        """Check if an archive member must be selected."""
+
+        base_name = os.path.basename(member_name)
+
+        if any(fnmatch(base_name, pattern) for pattern in self.__exclude):
+            return False
+
+        if any(fnmatch(base_name, pattern) for pattern in self.__include):
+            return True
+
+        if os.path.splitext(base_name)[1].lower() not in self.__extensions:
+            return False
+
+        match = MEMBER_SCOPE_PATTERN.search(base_name)
+        if match is None:
+            return False
+
+        scope = match.group('scope').upper()
+
+        if scope == NATIONAL_SCOPE:
+            return self.__scenario in ('national', 'all')
+
+        if self.__scenario == 'national':
+            return False
+
+        return self.__ufs is None or scope in self.__ufs
+
+    def select(self, member_names: Iterable[str]) -> List[str]:
+        """Return the selected member names, keeping the archive order."""
+
+        return [member_name for member_name in member_names if self.matches(member_name)]
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: parquet_dataset.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+import glob
+import os
+import re
+from typing import List, NamedTuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.utils.helpers import delete_file, make_directory
+
+# Processed voting data, one Hive partition per election year and UF.
+DATASET_DIRECTORY = 'data/votacao_candidato_munzona'
+
+# Partition columns, in the order of the directory levels.
+PARTITION_COLUMNS = ['ANO_ELEICAO', 'SG_UF']
+
+# Summary of the footers of all the partition files.
+METADATA_FILE_NAME = '_metadata'
+
+# Schema metadata key with the column profile a partition was written with.
+COLUMN_PROFILE_KEY = b'column_profile'
+
+# Order of the rows in the row groups of the partitions, so filters on an
+# office or a municipality skip most row groups.
+SORT_COLUMNS = ['DS_CARGO', 'CD_MUNICIPIO']
+
+
+class ParquetLayout(NamedTuple):
+    """Row groups and compression of the partition files."""
+
+    row_group_size: int = 128 * 1024
+    compression: str = 'zstd'
+
+
+def partition_file_path(dataset_dir: str, year: int, uf: str) -> str:
+    """Path of the Parquet file of a partition.
+
+    Arguments:
+        dataset_dir {str} -- Root directory of the dataset.
+        year {int} -- Election year.
+        uf {str} -- State (UF) of the partition.
+    """
+
+    return f'{dataset_dir}/ANO_ELEICAO={year}/SG_UF={uf}/part-0.parquet'
+
+
+def list_partition_files(dataset_dir: str) -> List[str]:
+    """List the Parquet files of all partitions of the dataset."""
+
+    return sorted(glob.glob(f'{dataset_dir}/ANO_ELEICAO=*/SG_UF=*/*.parquet'))
+
+
+def list_years(dataset_dir: str) -> List[int]:
+    """List the election years of the dataset from its directory names, without opening any file."""
+
+    years = [re.fullmatch(r'ANO_ELEICAO=(\d{4})', os.path.basename(path))
+             for path in glob.glob(f'{dataset_dir}/ANO_ELEICAO=*')]
+
+    return sorted(int(year.group(1)) for year in years if year)
+
+
+def read_column_profile(file_path: str) -> str:
+    """Column profile a partition file was written with, None if unknown."""
+
+    metadata = pq.read_schema(file_path).metadata or {}
+    profile = metadata.get(COLUMN_PROFILE_KEY)
+
+    return profile.decode() if profile else None
+
+
+class PartitionWriter:
+    """Stream tables or record batches to the partitions of the dataset.
+
+    Each partition gets its own `ParquetWriter` on a temporary file, opened
+    on its first rows, and every write appends row groups to it. The
+    partitions are only replaced when the writer is closed without error.
+    The partition columns are stored in the directory names only, and the
+    column profile in the schema metadata.
+
+    The rows are buffered per partition and office (the first sort column),
+    and a buffer is sorted and flushed as full row groups once it holds
+    `row_group_size` rows; the remainders are flushed on commit. Whatever the
+    size of the writes, every row group holds a single office sorted by
+    municipality, so a filter on an office skips the row groups of the others.
+    A whole partition written at once is also sorted across its row groups of
+    each office; streamed writes are only sorted within each row group. The
+    memory is bounded by `row_group_size` rows per open partition and office.
+
+    The files have the given row groups and compression, plus column
+    statistics, a page index and the sorting columns, so the readers can skip
+    the row groups and pages outside their filters.
+
+    Arguments:
+        dataset_dir {str} -- Root directory of the dataset.
+        schema {pa.Schema} -- Schema of the data, with the partition columns.
+        column_profile {str} -- Column profile of the data. Defaults to 'full'.
+        layout {ParquetLayout} -- Row groups and compression. Defaults to ParquetLayout().
+    """
+
+    def __init__(self,
+                 dataset_dir: str,
+                 schema: pa.Schema,
+                 column_profile: str = 'full',
+                 layout: ParquetLayout = None) -> None:
+        self.__dataset_dir = dataset_dir
+        self.__schema = pa.schema([field for field in schema if field.name not in PARTITION_COLUMNS],
+                                  metadata={COLUMN_PROFILE_KEY: column_profile.encode()})
+        self.__sort_keys = [(column, 'ascending') for column in SORT_COLUMNS if column in self.__schema.names]
+        self.__layout = layout or ParquetLayout()
+        self.__writers = {}
+        self.__buffers = {}
+
+    def __enter__(self) -> 'PartitionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def __open_writer(self, year: int, uf: str) -> pq.ParquetWriter:
+        """Writer of a partition, opened on its first row group."""
+
+        if (year, uf) not in self.__writers:
+            file_path = partition_file_path(self.__dataset_dir, year, uf)
+            make_directory(os.path.dirname(file_path))
+            self.__writers[(year, uf)] = pq.ParquetWriter(
+                f'{file_path}.tmp',
+                self.__schema,
+                compression=self.__layout.compression,
+                write_statistics=True,
+                write_page_index=True,
+                sorting_columns=pq.SortingColumn.from_ordering(self.__schema, self.__sort_keys)
+                if self.__sort_keys else None)
+
+        return self.__writers[(year, uf)]
+
+    def __write_partition(self, year: int, uf: str, data) -> None:
+        """Buffer the rows of a single partition by office, flushing the full buffers."""
+
+        data = pa.Table.from_batches([data]) if isinstance(data, pa.RecordBatch) else data
+        data = data.drop_columns(PARTITION_COLUMNS).replace_schema_metadata(self.__schema.metadata)
+
+        group_column = self.__sort_keys[0][0] if self.__sort_keys else None
+        groups = pc.unique(data.column(group_column)).to_pylist() if group_column else [None]
+
+        for group in groups:
+            group_data = data if len(groups) == 1 else data.filter(pc.equal(data.column(group_column), group))
+            self.__buffers.setdefault((year, uf, group), []).append(group_data)
+
+            if sum(table.num_rows for table in self.__buffers[(year, uf, group)]) >= self.__layout.row_group_size:
+                self.__flush(year, uf, group, final=False)
+
+    def __flush(self, year: int, uf: str, group, final: bool) -> None:
+        """Sort a buffer and write its full row groups, or all of it when final."""
+
+        data = self.__sort(pa.concat_tables(self.__buffers.pop((year, uf, group))))
+
+        # The sorted tail is kept for the next rows, so the row groups stay full.
+        flushed_rows = data.num_rows if final else data.num_rows - data.num_rows % self.__layout.row_group_size
+        if flushed_rows < data.num_rows:
+            self.__buffers[(year, uf, group)] = [data.slice(flushed_rows)]
+
+        if flushed_rows:
+            self.__open_writer(year, uf).write_table(data.slice(0, flushed_rows),
+                                                     row_group_size=self.__layout.row_group_size)
+
+    def __sort(self, data: pa.Table) -> pa.Table:
+        """Sort the rows of a buffer by the sort columns."""
+
+        if not self.__sort_keys:
+            return data
+
+        # Dictionaries can not be sorted directly, so the keys are sorted by value.
+        sort_keys = pa.table({column: (data.column(column).cast(pa.string())
+                                       if pa.types.is_dictionary(data.schema.field(column).type)
+                                       else data.column(column))
+                              for column, _ in self.__sort_keys})
+
+        return data.take(pc.sort_indices(sort_keys, sort_keys=self.__sort_keys))
+
+    def write(self, data) -> None:
+        """Append the rows of a table or record batch to the partitions of their years and states."""
+
+        years = pc.unique(data.column('ANO_ELEICAO')).to_pylist()
+        ufs = pc.unique(data.column('SG_UF')).to_pylist()
+
+        # The per-UF files of a year hold a single partition.
+        if len(years) == 1 and len(ufs) == 1:
+            self.__write_partition(years[0], ufs[0], data)
+            return
+
+        for year in years:
+            for uf in ufs:
+                partition_data = data.filter(pc.and_(pc.equal(data.column('ANO_ELEICAO'), year),
+                                                     pc.equal(data.column('SG_UF'), uf)))
+                if partition_data.num_rows:
+                    self.__write_partition(year, uf, partition_data)
+
+    def commit(self) -> List[str]:
+        """Close the writers and replace the partitions.
+
+        Returns:
+            List[str] -- Paths of the written partition files.
+        """
+
+        file_paths = []
+
+        try:
+            for year, uf, group in sorted(self.__buffers, key=lambda key: (key[0], key[1], str(key[2]))):
+                self.__flush(year, uf, group, final=True)
+        except BaseException:
+            self.abort()
+            raise
+
+        for (year, uf), writer in self.__writers.items():
+            writer.close()
+            file_path = partition_file_path(self.__dataset_dir, year, uf)
+            os.replace(f'{file_path}.tmp', file_path)
+            file_paths.append(file_path)
+
+        self.__writers.clear()
+
+        return file_paths
+
+    def abort(self) -> None:
+        """Close the writers and discard the partitions, keeping the previous ones."""
+
+        for (year, uf), writer in self.__writers.items():
+            writer.close()
+            delete_file(f'{partition_file_path(self.__dataset_dir, year, uf)}.tmp')
+
+        self.__writers.clear()
+        self.__buffers.clear()
+
+
+def write_metadata(dataset_dir: str) -> None:
+    """Rebuild the `_metadata` file from the footers of all the partition files.
+
+    Raises:
+        ValueError: If the partition files do not share the same schema.
+    """
+
+    partition_files = list_partition_files(dataset_dir)
+    if not partition_files:
+        return
+
+    schema = pq.read_schema(partition_files[0])
+    metadata_collector = []
+
+    for file_path in partition_files:
+        # Partitions written with other column profiles can not be summarized together.
+        if not pq.read_schema(file_path).equals(schema):
+            raise ValueError(f'The schema of {file_path} differs from {partition_files[0]}. '
+                             'Rewrite all the years with the same column profile.')
+
+        metadata = pq.read_metadata(file_path)
+        metadata.set_file_path(os.path.relpath(file_path, dataset_dir).replace(os.sep, '/'))
+        metadata_collector.append(metadata)
+
+    metadata_file_path = f'{dataset_dir}/{METADATA_FILE_NAME}'
+    temporary_file_path = f'{metadata_file_path}.tmp'
+
+    try:
+        pq.write_metadata(schema, temporary_file_path, metadata_collector=metadata_collector)
+        os.replace(temporary_file_path, metadata_file_path)
+    except BaseException:
+        delete_file(temporary_file_path)
+        raise
+
+
+def open_dataset(dataset_dir: str) -> ds.Dataset:
+    """Open the dataset from its `_metadata` file, falling back to listing the partitions."""
+
+    partitioning = ds.partitioning(pa.schema([('ANO_ELEICAO', pa.int64()), ('SG_UF', pa.string())]),
+                                   flavor='hive')
+    metadata_file_path = f'{dataset_dir}/{METADATA_FILE_NAME}'
+
+    if os.path.exists(metadata_file_path):
+        return ds.parquet_dataset(metadata_file_path, partitioning=partitioning)
+
+    return ds.dataset(dataset_dir, format='parquet', partitioning=partitioning)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: party_lineage.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.utils.political_parties import (parties_changed_names_mapping,
+                                         parties_incorporated_mapping,
+                                         parties_merged_mapping)
+
+# Successor of each extinct or renamed party; no party appears in more than one mapping.
+PARTY_SUCCESSORS = {**parties_merged_mapping, **parties_incorporated_mapping, **parties_changed_names_mapping}
+
+
+class PartyLineageResolver:
+    """Resolve each party to the first party of its lineage with a known position.
+
+    The lineages are followed once, when the resolver is created, into a
+    lookup table from every party of the mappings to its resolved party. A
+    party with a position of its own is never replaced, and the cycles of the
+    mappings (e.g. PL -> PR -> PL) stop at the first party seen twice.
+
+    Arguments:
+        known_parties {Iterable[str]} -- Parties with a known position.
+    """
+
+    def __init__(self, known_parties: Iterable[str]) -> None:
+        self.__known_parties = set(known_parties)
+        self.__lineage = {party: self.__follow_lineage(party) for party in PARTY_SUCCESSORS}
+
+    def __follow_lineage(self, party: str) -> str:
+        """Follow the successors of a party until one has a known position."""
+
+        current_party = party
+        seen_parties = set()
+
+        while current_party not in self.__known_parties and current_party in PARTY_SUCCESSORS:
+            seen_parties.add(current_party)
+            current_party = PARTY_SUCCESSORS[current_party]
+
+            if current_party in seen_parties:
+                return party
+
+        return current_party if current_party in self.__known_parties else party
+
+    @property
+    def lineage(self) -> Dict[str, str]:
+        return dict(self.__lineage)
+
+    def resolve(self, party: str) -> str:
+        """Party whose position applies to the given party."""
+
+        return self.__lineage.get(party, party)
+
+    def resolve_all(self, parties: Iterable[str]) -> List[str]:
+        """Resolve the distinct values (e.g. the categories) of a party column."""
+
+        return [self.resolve(party) for party in parties]
+
+
+@lru_cache(maxsize=None)
+def load_party_positions(file_path: str = 'data/positions_brazilian_parties.csv') -> pd.DataFrame:
+    """Load positions of Brazilian parties, once per process.
+
+    The returned DataFrame is shared and must not be modified.
+    """
+
+    return pd.read_csv(file_path, sep=';').drop_duplicates('SG_PARTIDO')
+
+
+@lru_cache(maxsize=None)
+def party_lineage_resolver(file_path: str = 'data/positions_brazilian_parties.csv') -> PartyLineageResolver:
+    """Resolver of the parties with a position in the positions file, once per process."""
+
+    return PartyLineageResolver(load_party_positions(file_path)['SG_PARTIDO'])
+
+
+def attach_party_positions(dataframe: pd.DataFrame,
+                           file_path: str = 'data/positions_brazilian_parties.csv') -> pd.DataFrame:
+    """Append the positions of the parties, resolved through their lineages, to a DataFrame.
+
+    The lineages are resolved once per distinct party (category) and the
+    rows are then gathered by the category codes, without per-row Python work.
+    """
+
+    positions_df = load_party_positions(file_path).set_index('SG_PARTIDO')
+    parties = dataframe['SG_PARTIDO'].astype('category')
+    resolved_parties = party_lineage_resolver(file_path).resolve_all(parties.cat.categories)
+
+    # One position row per category, plus an empty row for the missing parties.
+    category_positions = positions_df.reindex(resolved_parties + [None]).reset_index(drop=True)
+    codes = parties.cat.codes.to_numpy()
+    codes = np.where(codes < 0, len(resolved_parties), codes)
+
+    positions = category_positions.take(codes).set_index(dataframe.index)
+
+    return pd.concat([dataframe, positions], axis=1)
+
+
+def take_party_positions(parties: pa.Array,
+                         party_positions: pa.Table,
+                         resolver: PartyLineageResolver) -> pa.Table:
+    """Rows of the positions table for an Arrow column of parties, resolved through their lineages.
+
+    Arguments:
+        parties {pa.Array} -- Dictionary-encoded or plain column of parties.
+        party_positions {pa.Table} -- Positions table, with the SG_PARTIDO column.
+        resolver {PartyLineageResolver} -- Resolver of the parties of the positions table.
+
+    Returns:
+        pa.Table -- The position columns, one row per party, null for the unknown parties.
+    """
+
+    if not pa.types.is_dictionary(parties.type):
+        parties = pc.dictionary_encode(parties)
+
+    resolved_parties = pa.array(resolver.resolve_all(parties.dictionary.to_pylist()), type=pa.string())
+
+    # Row of each category in the positions table, then of each row through its index.
+    category_rows = pc.index_in(resolved_parties, value_set=party_positions.column('SG_PARTIDO').cast(pa.string()))
+    rows = category_rows.take(parties.indices)
+
+    return party_positions.drop_columns(['SG_PARTIDO']).take(rows)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: tse_schema.py
+#  Version: 0.0.1
+#
+#  Summary: Alinhamento Político Brasileiro
+#           Este projeto busca identificar tendencias políticas nos municípios
+#           brasileiros ao longo do tempo, classificando os prefeitos eleitos
+#           em direita, esquerda ou centro, com base no diagrama de Nolan.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-module-docstring, missing-function-docstring
+
+from typing import List
+
+import pyarrow as pa
+
+# Low-cardinality text, stored as dictionary indices (the only index width
+# the pyarrow CSV reader can decode into).
+DICTIONARY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+# Integer codes, numbers and counts, by column name and by prefix.
+INTEGER_COLUMN_TYPES = {'NR_TURNO': pa.int8()}
+INTEGER_PREFIX_TYPES = {'ANO_': pa.int16(),
+                        'CD_': pa.int32(),
+                        'NR_': pa.int32(),
+                        'SQ_': pa.int64(),
+                        'QT_': pa.int32()}
+
+# Text columns with a few hundred distinct values at most, by name and by prefix.
+DICTIONARY_COLUMNS = {'NM_TIPO_ELEICAO',
+                      'NM_UE',
+                      'NM_MUNICIPIO',
+                      'NM_PARTIDO',
+                      'NM_FEDERACAO',
+                      'NM_TIPO_DESTINACAO_VOTOS',
+                      'Espectro',
+                      'Espectro_Detalhado',
+                      'Posicionamento'}
+DICTIONARY_COLUMN_PREFIXES = ('DT_', 'HH_', 'TP_', 'ST_', 'SG_', 'DS_')
+
+
+def tse_column_type(column_name: str) -> pa.DataType:
+    """Arrow type of a TSE column, inferred from its name.
+
+    Arguments:
+        column_name {str} -- Name of the column.
+
+    Returns:
+        pa.DataType -- An integer of explicit width for codes, numbers and
+                       counts, a dictionary for low-cardinality text and a
+                       string otherwise (e.g. the candidate names).
+    """
+
+    if column_name in INTEGER_COLUMN_TYPES:
+        return INTEGER_COLUMN_TYPES[column_name]
+
+    for prefix, integer_type in INTEGER_PREFIX_TYPES.items():
+        if column_name.startswith(prefix):
+            return integer_type
+
+    if column_name in DICTIONARY_COLUMNS or column_name.startswith(DICTIONARY_COLUMN_PREFIXES):
+        return DICTIONARY_TYPE
+
+    return pa.string()
+
+
+def tse_schema(column_names: List[str]) -> pa.Schema:
+    """Arrow schema of a TSE file with the given columns.
+
+    Every file of a year is parsed with the same schema, so the batches of
+    all the per-UF files can be written to a single Parquet file.
+    """
+
+    return pa.schema([(column_name, tse_column_type(column_name)) for column_name in column_names])
+
+
+def text_column_dtypes(column_names: List[str]) -> dict:
+    """Pandas dtypes of the text columns of a TSE file.
+
+    The text columns are read as strings, so codes such as SG_UE keep their
+    leading zeros instead of being parsed as numbers.
+    """
+
+    return {column_name: str for column_name in column_names
+            if not pa.types.is_integer(tse_column_type(column_name))}
+
+
+def cast_to_tse_schema(table: pa.Table) -> pa.Table:
+    """Cast a table, e.g. converted from pandas, to the TSE schema of its columns."""
+
+    return table.cast(tse_schema(table.column_names))